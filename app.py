@@ -1,16 +1,21 @@
 import streamlit as st
-import geopandas as gpd
 from pathlib import Path
 from src.database.db_manager import DBManager
-from src.clients.osm_client import OSMClient
 from src.utils import get_project_dir
 
 # --- CONFIGURATION & SETUP ---
 st.set_page_config(page_title="Energy Intelligence Platform", layout="wide")
 
 DB_PATH = Path("data/system/global_registry.sqlite")
-db = DBManager(DB_PATH)
-osm_client = OSMClient()
+
+
+@st.cache_resource
+def get_db() -> DBManager:
+    # Schema setup runs once per server process instead of on every rerun
+    return DBManager(DB_PATH)
+
+
+db = get_db()
 
 # --- SIDEBAR: Project Selection ---
 st.sidebar.title("Navigation")
@@ -38,6 +43,7 @@ if selected_project == "-- Create New Project --":
     with col1:
         project_name = st.text_input("Project Name", placeholder="e.g., Berlin_North_Grid")
         method = st.radio("Inbound Data Method", ["OSM Wizard (Search)", "Manual GeoJSON Upload"])
+        priority = st.slider("Monitoring Priority", 0, 10, 0, help="Higher priority projects (e.g. critical substations) are re-analysed first.")
 
     with col2:
         if method == "OSM Wizard (Search)":
@@ -58,6 +64,10 @@ if selected_project == "-- Create New Project --":
             if method == "OSM Wizard (Search)" and location_query:
                 with st.spinner(f"Fetching {infra_type} data for {location_query} from OSM..."):
                     try:
+                        # OSMnx/GeoPandas are only loaded when a project is actually created
+                        from src.clients.osm_client import OSMClient
+                        osm_client = OSMClient()
+
                         # For simplicity, we fetch the first selected type
                         gdf = osm_client.fetch_power_data(location_query, infra_type[0])
                         osm_client.save_to_project(gdf, paths["raw"], "infrastructure")
@@ -72,7 +82,7 @@ if selected_project == "-- Create New Project --":
 
             # 3. Register in Database
             if success:
-                db.register_project(project_name)
+                db.register_project(project_name, priority)
                 st.success(f"Project '{project_name}' registered! The Background Worker will start the analysis shortly.")
                 st.rerun()
 
@@ -89,15 +99,34 @@ else:
     if status == "COMPLETED":
         st.subheader("Analysis Summary")
         # Load results from database
-        results_df = db.get_results_for_project(selected_project)
+        results_df = db.get_results_for_project(selected_project, active_only=True)
 
         if not results_df.empty:
             c1, c2, c3 = st.columns(3)
-            c1.metric("Total Hotspots", len(results_df))
+            c1.metric("Active Hotspots", len(results_df))
             c2.metric("High Severity", len(results_df[results_df['severity'] == 'HIGH']))
             c3.metric("Medium Severity", len(results_df[results_df['severity'] == 'MEDIUM']))
 
-            st.dataframe(results_df[['module_type', 'severity', 'description', 'detected_at']], use_container_width=True)
+            st.dataframe(results_df[['module_type', 'severity', 'description', 'detected_at', 'last_seen', 'occurrences']], use_container_width=True)
+
+            # --- Asset Risk Ranking (precomputed by the worker's fusion stage) ---
+            st.subheader("Top 100 Riskiest Assets")
+            risk_df = db.get_top_risk_assets(selected_project, limit=100)
+            if risk_df.empty:
+                st.write("No hotspots could be attributed to an infrastructure asset.")
+            else:
+                st.dataframe(
+                    risk_df[['asset_id', 'asset_type', 'risk_score', 'max_severity',
+                             'veg_hotspots', 'gas_hotspots', 'thermal_hotspots', 'ground_hotspots']],
+                    use_container_width=True
+                )
+                selected_asset = st.selectbox("Asset Drilldown", risk_df['asset_id'])
+                st.dataframe(
+                    db.get_asset_detections(selected_project, selected_asset)[
+                        ['module_type', 'severity', 'description', 'status', 'last_seen', 'occurrences', 'distance_m']
+                    ],
+                    use_container_width=True
+                )
 
             # Placeholder for the Map (We will implement this in the /pages files)
             st.button("View Detailed Interactive Map", on_click=lambda: st.switch_page("pages/1_VegWatch_UI.py"))
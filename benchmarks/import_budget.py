@@ -0,0 +1,77 @@
+"""
+Import-time budget check for the fast-start paths.
+
+Each entry point is imported in a fresh interpreter with `-X importtime`; the
+check fails if its cumulative import time exceeds the budget or if one of the
+heavy geospatial dependencies got pulled in eagerly.
+
+Usage:
+    python -m benchmarks.import_budget --budget-ms 500
+"""
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+from typing import List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must stay importable without the geospatial stack
+ENTRY_POINTS = [
+    "run_worker",
+    "src.database.db_manager",
+    "src.clients.stac_client",
+    "src.clients.osm_client",
+]
+
+# Dependencies that are only allowed to be loaded on first use
+HEAVY_MODULES = [
+    "stackstac", "xarray", "osmnx", "geopandas", "planetary_computer",
+    "pystac_client", "rasterio", "leafmap", "folium", "pandas", "dask",
+]
+
+
+def measure_import(module: str) -> Tuple[float, List[str]]:
+    """
+    Returns the cumulative import time (ms) of `module` and the heavy
+    dependencies it loaded, measured in a clean subprocess.
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    # importtime lines: "import time: self [us] | cumulative | imported package"
+    cumulative_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Only top-level imports (no indentation) are summed to avoid double counting
+        if not name.startswith("  "):
+            cumulative_us += int(cumulative)
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return cumulative_us / 1000, loaded
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check import-time budgets of the fast-start paths")
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="Maximum cumulative import time per entry point")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for module in ENTRY_POINTS:
+        elapsed_ms, loaded = measure_import(module)
+        ok = elapsed_ms <= args.budget_ms and not loaded
+        failures += not ok
+        status = "OK  " if ok else "FAIL"
+        extra = f" (eagerly loaded: {', '.join(loaded)})" if loaded else ""
+        print(f"{status} {module:<28} {elapsed_ms:8.1f} ms{extra}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import pystac
+from datetime import datetime, timezone
+from pathlib import Path
+from pyproj import Transformer
+from shapely.geometry import box, mapping
+from typing import Dict, List, Optional
+from src.clients.stac_client import STACClient
+from src import instrumentation
+
+# Media types of the synthetic assets
+COG_MEDIA_TYPE = pystac.MediaType.COG
+NETCDF_MEDIA_TYPE = "application/netcdf"
+
+
+def _lonlat_bbox(scene: Dict) -> List[float]:
+    if "bbox" in scene:
+        return scene["bbox"]
+    to_lonlat = Transformer.from_crs(scene["epsg"], 4326, always_xy=True)
+    minx, miny, maxx, maxy = scene["utm_bounds"]
+    return list(to_lonlat.transform_bounds(minx, miny, maxx, maxy))
+
+
+def build_catalog(scenes: List[Dict], root: Path) -> Path:
+    """
+    Writes a self-contained static STAC catalog (one collection per sensor)
+    describing the synthetic scenes. Returns the path of catalog.json.
+    """
+    catalog = pystac.Catalog(id="mayil-synthetic", description="Synthetic scenes for offline benchmarks")
+    collections: Dict[str, pystac.Collection] = {}
+
+    for scene in scenes:
+        bbox = _lonlat_bbox(scene)
+        if scene["collection"] not in collections:
+            collections[scene["collection"]] = pystac.Collection(
+                id=scene["collection"],
+                description=f"Synthetic {scene['collection']}",
+                extent=pystac.Extent(pystac.SpatialExtent([bbox]), pystac.TemporalExtent([[None, None]])),
+            )
+
+        properties = {"eo:cloud_cover": scene["cloud_cover"]}
+        if "epsg" in scene:
+            properties.update({
+                "proj:epsg": scene["epsg"],
+                "proj:transform": scene["transform"],
+                "proj:shape": scene["shape"],
+            })
+
+        item = pystac.Item(
+            id=scene["id"],
+            geometry=mapping(box(*bbox)),
+            bbox=bbox,
+            datetime=datetime.fromisoformat(scene["datetime"].replace("Z", "+00:00")),
+            properties=properties,
+            collection=scene["collection"],
+        )
+        for name, path in scene["assets"].items():
+            media_type = NETCDF_MEDIA_TYPE if Path(path).suffix == ".nc" else COG_MEDIA_TYPE
+            # Assets on their own grid carry asset-level projection fields, as on Planetary Computer
+            grid = scene.get("asset_grids", {}).get(name)
+            extra_fields = {"proj:transform": grid["transform"], "proj:shape": grid["shape"]} if grid else None
+            item.add_asset(name, pystac.Asset(
+                href=str(Path(path).resolve()), media_type=media_type, roles=["data"], extra_fields=extra_fields
+            ))
+        collections[scene["collection"]].add_item(item)
+
+    for collection in collections.values():
+        collection.update_extent_from_items()
+        catalog.add_child(collection)
+
+    catalog.normalize_hrefs(str(root))
+    catalog.save(catalog_type=pystac.CatalogType.SELF_CONTAINED)
+    return root / "catalog.json"
+
+
+class LocalSTACClient(STACClient):
+    """
+    Drop-in replacement for STACClient that searches a local static catalog.
+    Used by the benchmark suite so that runs are reproducible without network access.
+    """
+    def __init__(self, catalog_path: Path):
+        super().__init__()
+        self.api_url = str(catalog_path)
+        catalog = pystac.Catalog.from_file(str(catalog_path))
+        # Static catalogs have no search endpoint, so all items are indexed up front
+        self.items = {c.id: list(c.get_items()) for c in catalog.get_children()}
+
+    @staticmethod
+    def _parse_bound(value: str, end: bool) -> datetime:
+        # Date-only bounds cover the whole day, like the STAC API does
+        if len(value) == 10:
+            value += "T23:59:59.999999+00:00" if end else "T00:00:00+00:00"
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+    def search_imagery(self, bbox: List[float], datetime: str, collections: List[str], cloud_cover: int = 10):
+        """
+        Same contract as STACClient.search_imagery, evaluated against the local catalog.
+        """
+        start, end = datetime.split("/")
+        start, end = self._parse_bound(start, end=False), self._parse_bound(end, end=True)
+        search_geom = box(*bbox)
+
+        with instrumentation.span(f"stac.search.{'+'.join(collections)}"):
+            matches = [
+                item
+                for collection in collections
+                for item in self.items.get(collection, [])
+                if start <= item.datetime <= end
+                and item.properties.get("eo:cloud_cover", 0) < cloud_cover
+                and box(*item.bbox).intersects(search_geom)
+            ]
+            items = pystac.ItemCollection(matches)
+        instrumentation.increment("items_searched", len(items))
+        return items
+
+    def latest_acquisition(self, bbox: List[float], collection: str) -> Optional[str]:
+        """
+        Same contract as STACClient.latest_acquisition, evaluated against the local catalog.
+        """
+        search_geom = box(*bbox)
+        with instrumentation.span(f"stac.latest.{collection}"):
+            items = [item for item in self.items.get(collection, []) if box(*item.bbox).intersects(search_geom)]
+        instrumentation.increment("items_searched", min(len(items), 1))
+        return max(item.datetime for item in items).isoformat() if items else None
@@ -0,0 +1,188 @@
+"""
+Offline benchmark suite for the analysis engines and the DB layer.
+
+Synthetic power grids of several sizes are generated together with matching
+Sentinel-2 / Landsat / Sentinel-1 COGs and Sentinel-5P NetCDFs, served through a
+local static STAC catalog. Every engine is run end-to-end against it and the
+per-stage timings (from src.instrumentation), peak Python memory and throughput
+are written to a JSON report that can be compared against a previous run.
+
+Usage:
+    python -m benchmarks.run_benchmarks --scales 1 10 100 --output bench_results.json
+    python -m benchmarks.run_benchmarks --baseline bench_results.json --output bench_new.json
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.synthetic import make_detections, make_power_lines, make_scenes
+from benchmarks.mock_stac import LocalSTACClient, build_catalog
+from src.database.db_manager import DBManager
+from src.database.hotspot_tracker import HotspotTracker
+from modules.risk_fusion import RiskFusion
+from src import instrumentation
+
+from modules.veg_watch import VegWatch
+from modules.gas_watch import GasWatch
+from modules.thermal_alert import ThermalAlert
+from modules.ground_guard import GroundGuard
+
+SCHEMA_VERSION = 1
+DEFAULT_SCALES_KM = [1, 10, 100, 1000]
+ENGINES = {
+    "VegWatch": VegWatch,
+    "GasWatch": GasWatch,
+    "ThermalAlert": ThermalAlert,
+    "GroundGuard": GroundGuard,
+}
+# Detections per DB benchmark iteration, spread along a grid of DB_GRID_KM line length
+# (about 100 m apart, so they don't merge into each other's hotspots)
+DB_ROWS = 10_000
+DB_GRID_KM = 1000
+
+
+def measure(name: str, scale_km: float, fn: Callable) -> Dict:
+    """
+    Runs `fn` once and returns wall time, peak traced memory and the
+    spans/counters recorded by the instrumentation layer.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    with instrumentation.track_run(f"bench_{name}_{scale_km}km") as run:
+        output = fn()
+    wall_seconds = time.perf_counter() - start
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pixels = run.counters.get("pixels_processed", 0)
+    return {
+        "name": name,
+        "scale_km": scale_km,
+        "wall_seconds": wall_seconds,
+        "peak_memory_bytes": peak_bytes,
+        "stages": {stage: span["total_seconds"] for stage, span in run.spans.items()},
+        "counters": run.counters,
+        "throughput": {
+            "km_per_second": scale_km / wall_seconds if wall_seconds else None,
+            "pixels_per_second": pixels / wall_seconds if wall_seconds and pixels else None,
+        },
+        "output_size": len(output) if hasattr(output, "__len__") else None,
+    }
+
+
+def bench_engines(scale_km: float, workdir: Path) -> List[Dict]:
+    """
+    Benchmarks all four engines on a synthetic grid of `scale_km` line length.
+    """
+    scale_dir = workdir / f"{scale_km}km"
+    gdf = make_power_lines(scale_km)
+    catalog_path = scale_dir / "stac" / "catalog.json"
+    if not catalog_path.exists():
+        scenes = make_scenes(gdf, scale_dir / "scenes")
+        build_catalog(scenes, scale_dir / "stac")
+
+    client = LocalSTACClient(catalog_path)
+    results = []
+    for name, engine_cls in ENGINES.items():
+        engine = engine_cls(client)
+        print(f"  {name} @ {scale_km} km ...")
+        results.append(measure(name, scale_km, lambda: engine.run_analysis(f"bench_{scale_km}km", gdf)))
+    return results
+
+
+def bench_db(workdir: Path, n_rows: int = DB_ROWS) -> List[Dict]:
+    """
+    Benchmarks the worker's write path (hotspot tracking and risk fusion) and
+    project reads on a throwaway registry.
+    """
+    db_path = workdir / "bench_registry.sqlite"
+    if db_path.exists():
+        db_path.unlink()
+    db = DBManager(db_path, sharded=False)
+    tracker = HotspotTracker(db)
+    fusion = RiskFusion(db)
+    project = "bench_db"
+    db.register_project(project)
+
+    gdf = make_power_lines(DB_GRID_KM)
+    detections = make_detections(gdf, n_rows)
+
+    # First run inserts every hotspot, the second one matches all of them again
+    new = measure("DB.track_new", 0, lambda: tracker.track(project, "VEG", detections))
+    recurring = measure("DB.track_recurring", 0, lambda: tracker.track(project, "VEG", detections))
+    fused = measure("DB.run_fusion", 0, lambda: fusion.run_fusion(project, gdf))
+    read = measure("DB.get_results_for_project", 0, lambda: db.get_results_for_project(project))
+    for res in (new, recurring, fused, read):
+        res["throughput"]["rows_per_second"] = n_rows / res["wall_seconds"] if res["wall_seconds"] else None
+    return [new, recurring, fused, read]
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Returns human readable regressions (wall time or peak memory grown by more
+    than `tolerance`, relative) between two benchmark reports.
+    """
+    previous = {(r["name"], r["scale_km"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for res in current["results"]:
+        old = previous.get((res["name"], res["scale_km"]))
+        if old is None:
+            continue
+        for metric in ("wall_seconds", "peak_memory_bytes"):
+            if old[metric] and res[metric] > old[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{res['name']} @ {res['scale_km']} km: {metric} {old[metric]:.4g} -> {res[metric]:.4g} "
+                    f"(+{(res[metric] / old[metric] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mayil Vision offline benchmark suite")
+    parser.add_argument("--scales", type=float, nargs="+", default=DEFAULT_SCALES_KM, help="Grid sizes in km of power line")
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--workdir", type=Path, default=None, help="Keep synthetic data here to reuse it between runs")
+    parser.add_argument("--baseline", type=Path, default=None, help="Previous report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown before flagging a regression")
+    parser.add_argument("--skip-db", action="store_true")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="mayil_bench_") as tmp:
+        workdir = args.workdir or Path(tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+
+        results = []
+        for scale_km in args.scales:
+            print(f"Benchmarking grid of {scale_km} km ...")
+            results.extend(bench_engines(scale_km, workdir))
+        if not args.skip_db:
+            print("Benchmarking DB layer ...")
+            results.extend(bench_db(workdir))
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Benchmark report written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
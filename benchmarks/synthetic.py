@@ -0,0 +1,253 @@
+import math
+import numpy as np
+import xarray as xr
+import geopandas as gpd
+import rasterio
+from rasterio.transform import from_origin
+from pyproj import Transformer
+from shapely.geometry import LineString
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# All synthetic grids are placed in central Germany (UTM zone 32N)
+ORIGIN_LONLAT = (9.5, 51.0)
+UTM_EPSG = 32632
+
+# Spacing between the parallel runs of the serpentine line layout (meters)
+LINE_SPACING_M = 1000
+
+# Scene layout per collection: assets, native resolution (m), dtype and acquisition dates.
+# Assets delivered at a different resolution are listed in "asset_resolution" (like the
+# 20 m Sentinel-2 SCL band). The dates fall into the default search windows of the engines.
+COLLECTIONS = {
+    "sentinel-2-l2a": {
+        "assets": ["B04", "B08", "SCL"],
+        "resolution": 10,
+        "asset_resolution": {"SCL": 20},
+        "dtype": "uint16",
+        "dates": ["2026-02-05", "2026-02-10", "2026-02-15", "2026-02-20"],
+    },
+    "landsat-c2-l2": {
+        "assets": ["lwir11"],
+        "resolution": 30,
+        "dtype": "uint16",
+        "dates": ["2026-02-03", "2026-02-19"],
+    },
+    "sentinel-1-grd": {
+        "assets": ["vv", "vh"],
+        "resolution": 10,
+        "dtype": "float32",
+        "dates": ["2026-02-06", "2026-02-18"],
+    },
+}
+
+# Sentinel-5P is delivered as NetCDF swaths, not as COGs
+S5P_COLLECTION = "sentinel-5p-l2-netcdf"
+S5P_DATES = ["2026-02-10", "2026-02-11"]
+S5P_RESOLUTION_DEG = 0.05
+
+
+def make_power_lines(length_km: float) -> gpd.GeoDataFrame:
+    """
+    Builds a synthetic transmission grid of `length_km` total line length.
+    The line runs as a serpentine inside a square of roughly sqrt(length) km side,
+    so the raster footprint grows with the grid size like a real regional network.
+    """
+    side_m = max(math.sqrt(length_km), 1.0) * 1000
+    n_runs = max(int(math.ceil(length_km * 1000 / side_m)), 1)
+    remaining_m = length_km * 1000
+
+    to_lonlat = Transformer.from_crs(UTM_EPSG, 4326, always_xy=True)
+    x0, y0 = Transformer.from_crs(4326, UTM_EPSG, always_xy=True).transform(*ORIGIN_LONLAT)
+
+    lines = []
+    for run in range(n_runs):
+        run_length = min(side_m, remaining_m)
+        remaining_m -= run_length
+        y = y0 + run * LINE_SPACING_M
+        xs = (x0, x0 + run_length) if run % 2 == 0 else (x0 + side_m, x0 + side_m - run_length)
+        # Towers every ~300 m give the line realistic vertex density
+        n_vertices = max(int(run_length // 300), 1) + 1
+        coords = [to_lonlat.transform(x, y) for x in np.linspace(xs[0], xs[1], n_vertices)]
+        lines.append(LineString(coords))
+
+    return gpd.GeoDataFrame(
+        {"power": ["line"] * len(lines), "name": [f"synthetic_{i}" for i in range(len(lines))]},
+        geometry=lines,
+        crs="EPSG:4326",
+    )
+
+
+def make_detections(gdf: gpd.GeoDataFrame, n: int, offset_m: float = 20) -> List[Dict]:
+    """
+    Spreads `n` engine-style detections evenly along the grid, `offset_m` beside the line.
+    """
+    lines = gdf.to_crs(UTM_EPSG).geometry
+    total_m = float(lines.length.sum())
+    to_lonlat = Transformer.from_crs(UTM_EPSG, 4326, always_xy=True)
+
+    detections = []
+    for line in lines:
+        for distance in np.arange(total_m / n / 2, line.length, total_m / n):
+            point = line.interpolate(distance)
+            lon, lat = to_lonlat.transform(point.x, point.y + offset_m)
+            detections.append({
+                "lat": lat,
+                "lon": lon,
+                "severity": "HIGH",
+                "description": "Synthetic benchmark hotspot",
+            })
+    return detections[:n]
+
+
+def raster_grid(gdf: gpd.GeoDataFrame, resolution: float, buffer_m: float = 500) -> Tuple[rasterio.Affine, Tuple[int, int], List[float]]:
+    """
+    Returns transform, (height, width) and UTM bounds of a grid covering the grid bbox.
+    """
+    minx, miny, maxx, maxy = gdf.to_crs(UTM_EPSG).total_bounds
+    minx, miny, maxx, maxy = minx - buffer_m, miny - buffer_m, maxx + buffer_m, maxy + buffer_m
+    width = int(math.ceil((maxx - minx) / resolution))
+    height = int(math.ceil((maxy - miny) / resolution))
+    transform = from_origin(minx, maxy, resolution, resolution)
+    return transform, (height, width), [minx, maxy - height * resolution, minx + width * resolution, maxy]
+
+
+def _band_values(asset: str, shape: Tuple[int, int], rng: np.random.Generator, clouds: np.ndarray) -> np.ndarray:
+    """
+    Generates plausible pixel values for an asset. Vegetation appears as smooth
+    blobs so that NDVI-based detection finds a realistic number of hotspots.
+    """
+    height, width = shape
+    yy, xx = np.mgrid[0:height, 0:width]
+    vegetation = 0.5 + 0.5 * np.sin(xx / 37.0) * np.cos(yy / 53.0)
+
+    if asset == "B04":
+        values = 1200 - 700 * vegetation + rng.normal(0, 40, shape)
+        values[clouds] = 6000
+    elif asset == "B08":
+        values = 1500 + 2500 * vegetation + rng.normal(0, 60, shape)
+        values[clouds] = 6500
+    elif asset == "SCL":
+        values = np.where(vegetation > 0.5, 4, 5)
+        values[clouds] = 9
+        # Cloud shadows are offset from their clouds
+        values[np.roll(clouds, (12, 12), axis=(0, 1)) & ~clouds] = 3
+    elif asset == "lwir11":
+        # Landsat C2 ST scale: K = DN * 0.00341802 + 149.0 -> ~275 K background
+        values = 36900 + rng.normal(0, 150, shape)
+        values[(yy % 400 < 3) & (xx % 400 < 3)] += 4500
+    elif asset in ("vv", "vh"):
+        base = 0.12 if asset == "vv" else 0.03
+        values = rng.gamma(4.0, base / 4.0, shape)
+    else:
+        raise ValueError(f"Unknown synthetic asset: {asset}")
+    return values
+
+
+def write_cog(path: Path, data: np.ndarray, transform, dtype: str, nodata=None):
+    """
+    Writes a single-band Cloud Optimized GeoTIFF with internal overviews.
+    """
+    profile = {
+        "driver": "COG",
+        "width": data.shape[1],
+        "height": data.shape[0],
+        "count": 1,
+        "dtype": dtype,
+        "crs": f"EPSG:{UTM_EPSG}",
+        "transform": transform,
+        "nodata": nodata,
+        "compress": "deflate",
+        "blocksize": 512,
+        "overview_resampling": "average",
+    }
+    with rasterio.open(path, "w", **profile) as dst:
+        dst.write(data.astype(dtype), 1)
+
+
+def make_scenes(gdf: gpd.GeoDataFrame, out_dir: Path, seed: int = 42) -> List[Dict]:
+    """
+    Writes synthetic COG scenes for every raster collection and returns one
+    scene description per acquisition (consumed by the mock STAC catalog).
+    """
+    rng = np.random.default_rng(seed)
+    scenes = []
+    for collection, spec in COLLECTIONS.items():
+        transform, shape, utm_bounds = raster_grid(gdf, spec["resolution"])
+        for i, date in enumerate(spec["dates"]):
+            scene_id = f"{collection}_{date.replace('-', '')}"
+            scene_dir = out_dir / collection / scene_id
+            scene_dir.mkdir(parents=True, exist_ok=True)
+
+            # Random cloud patches, between 0% and ~45% of the scene
+            cloud_fraction = 0.15 * i
+            clouds = rng.random((max(shape[0] // 32, 1), max(shape[1] // 32, 1))) < cloud_fraction
+            clouds = np.kron(clouds, np.ones((32, 32), dtype=bool))[:shape[0], :shape[1]]
+            clouds = np.pad(clouds, ((0, shape[0] - clouds.shape[0]), (0, shape[1] - clouds.shape[1])))
+
+            assets, asset_grids = {}, {}
+            for asset in spec["assets"]:
+                path = scene_dir / f"{asset}.tif"
+                values = _band_values(asset, shape, rng, clouds)
+                asset_transform = transform
+                resolution = spec.get("asset_resolution", {}).get(asset, spec["resolution"])
+                if resolution != spec["resolution"]:
+                    # Coarser assets take every n-th pixel of the native grid (nearest neighbour)
+                    factor = resolution // spec["resolution"]
+                    values = values[::factor, ::factor]
+                    asset_transform, _, _ = raster_grid(gdf, resolution)
+                    asset_grids[asset] = {"transform": list(asset_transform)[:6], "shape": list(values.shape)}
+                write_cog(path, values, asset_transform, spec["dtype"], nodata=0 if spec["dtype"] == "uint16" else None)
+                assets[asset] = path
+
+            scenes.append({
+                "id": scene_id,
+                "collection": collection,
+                "datetime": f"{date}T10:30:00Z",
+                "cloud_cover": float(clouds.mean() * 100) if collection != "sentinel-1-grd" else 0.0,
+                "epsg": UTM_EPSG,
+                "transform": list(transform)[:6],
+                "shape": list(shape),
+                "utm_bounds": utm_bounds,
+                "assets": assets,
+                "asset_grids": asset_grids,
+            })
+
+    scenes.extend(make_s5p_scenes(gdf, out_dir, rng))
+    return scenes
+
+
+def make_s5p_scenes(gdf: gpd.GeoDataFrame, out_dir: Path, rng: np.random.Generator) -> List[Dict]:
+    """
+    Writes synthetic Sentinel-5P L2 CH4 NetCDF granules covering the grid.
+    """
+    minx, miny, maxx, maxy = gdf.total_bounds
+    lons = np.arange(minx - 0.5, maxx + 0.5, S5P_RESOLUTION_DEG)
+    lats = np.arange(miny - 0.5, maxy + 0.5, S5P_RESOLUTION_DEG)
+
+    scenes = []
+    for date in S5P_DATES:
+        scene_id = f"{S5P_COLLECTION}_{date.replace('-', '')}"
+        scene_dir = out_dir / S5P_COLLECTION
+        scene_dir.mkdir(parents=True, exist_ok=True)
+        path = scene_dir / f"{scene_id}.nc"
+
+        # Background of ~1900 ppb with a single point-source plume
+        ch4 = 1900 + rng.normal(0, 8, (len(lats), len(lons)))
+        ch4[len(lats) // 2, len(lons) // 2] += 60
+        ds = xr.Dataset(
+            {"methane_mixing_ratio": (("latitude", "longitude"), ch4.astype("float32"))},
+            coords={"latitude": lats, "longitude": lons},
+            attrs={"time_coverage_start": f"{date}T00:00:00Z"},
+        )
+        ds.to_netcdf(path, group="PRODUCT")
+
+        scenes.append({
+            "id": scene_id,
+            "collection": S5P_COLLECTION,
+            "datetime": f"{date}T12:00:00Z",
+            "cloud_cover": 0.0,
+            "bbox": [float(lons[0]), float(lats[0]), float(lons[-1]), float(lats[-1])],
+            "assets": {"ch4": path},
+        })
+    return scenes
@@ -0,0 +1,39 @@
+import sys
+import argparse
+from pathlib import Path
+
+from src.database.db_manager import DBManager
+from src.export import WRITERS, export_results
+
+DB_PATH = Path("data/system/global_registry.sqlite")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Export detections of a project to GeoParquet (.parquet), FlatGeobuf (.fgb) "
+                    "or newline-delimited GeoJSON (.ndjson)."
+    )
+    parser.add_argument("project", help="Project name")
+    parser.add_argument("output", type=Path, help="Output file; the format is inferred from the suffix")
+    parser.add_argument("--format", choices=sorted(WRITERS), default=None, help="Override the output format")
+    parser.add_argument("--module", action="append", choices=["VEG", "GAS", "THERMAL", "GROUND"], help="Repeatable")
+    parser.add_argument("--severity", action="append", choices=["LOW", "MEDIUM", "HIGH"], help="Repeatable")
+    parser.add_argument("--bbox", type=float, nargs=4, metavar=("MIN_LON", "MIN_LAT", "MAX_LON", "MAX_LAT"))
+    parser.add_argument("--since", help="Only hotspots seen at or after this time (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--until", help="Only hotspots first detected at or before this time (a date includes the whole day)")
+    parser.add_argument("--active-only", action="store_true", help="Skip resolved hotspots")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="Rows read and written per batch")
+    args = parser.parse_args(argv)
+
+    db = DBManager(DB_PATH)
+    count = export_results(
+        db, args.project, args.output, fmt=args.format,
+        modules=args.module, severities=args.severity, bbox=args.bbox,
+        since=args.since, until=args.until, active_only=args.active_only, chunksize=args.chunksize
+    )
+    print(f"Exported {count} results of '{args.project}' to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
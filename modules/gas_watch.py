@@ -2,7 +2,10 @@ import xarray as xr
 import numpy as np
 import geopandas as gpd
 from src.clients.stac_client import STACClient
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+# One month of Sentinel-5P for the initial analysis
+DEFAULT_SEARCH_WINDOW = "2026-02-01/2026-02-28"
 
 class GasWatch:
     """
@@ -11,9 +14,12 @@ class GasWatch:
     def __init__(self, stac_client: STACClient):
         self.stac_client = stac_client
 
-    def run_analysis(self, project_name: str, infra_gdf: gpd.GeoDataFrame) -> List[Dict]:
+    def run_analysis(self, project_name: str, infra_gdf: gpd.GeoDataFrame,
+                     search_window: Optional[str] = None) -> Optional[List[Dict]]:
         """
         Analyzes methane concentrations around the provided infrastructure.
+        :param search_window: STAC datetime range "start/end" (default: DEFAULT_SEARCH_WINDOW)
+        :return: detections, or None if no imagery was found
         """
         results = []
 
@@ -24,14 +30,14 @@ class GasWatch:
         # We use a 1-month window to get the most recent atmospheric state
         items = self.stac_client.search_imagery(
             bbox=bbox,
-            datetime="2026-02-01/2026-02-28",
+            datetime=search_window or DEFAULT_SEARCH_WINDOW,
             collections=["sentinel-5p-l2-netcdf"],
             cloud_cover=20 # Gas monitoring can handle slightly more clouds than optical
         )
 
         if not items:
             print(f"No methane data found for {project_name}")
-            return results
+            return None
 
         # 3. Processing Logic (Simplified for MVP)
         # In a production environment, we would open the NetCDF files
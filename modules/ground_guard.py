@@ -2,7 +2,10 @@ import stackstac
 import numpy as np
 import geopandas as gpd
 from src.clients.stac_client import STACClient
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+# Two months of Sentinel-1 passes for the initial analysis
+DEFAULT_SEARCH_WINDOW = "2026-01-01/2026-02-28"
 
 class GroundGuard:
     """
@@ -12,9 +15,12 @@ class GroundGuard:
     def __init__(self, stac_client: STACClient):
         self.stac_client = stac_client
 
-    def run_analysis(self, project_name: str, infra_gdf: gpd.GeoDataFrame) -> List[Dict]:
+    def run_analysis(self, project_name: str, infra_gdf: gpd.GeoDataFrame,
+                     search_window: Optional[str] = None) -> Optional[List[Dict]]:
         """
         Analyzes radar backscatter to identify potential ground instability.
+        :param search_window: STAC datetime range "start/end" (default: DEFAULT_SEARCH_WINDOW)
+        :return: detections, or None if no imagery was found
         """
         results = []
         bbox = list(infra_gdf.total_bounds)
@@ -23,14 +29,14 @@ class GroundGuard:
         # Collection: sentinel-1-grd
         items = self.stac_client.search_imagery(
             bbox=bbox,
-            datetime="2026-01-01/2026-02-28",
+            datetime=search_window or DEFAULT_SEARCH_WINDOW,
             collections=["sentinel-1-grd"],
             cloud_cover=100 # Radar penetrates clouds, so we don't care about cloud cover
         )
 
         if not items:
             print(f"No radar data found for {project_name}")
-            return results
+            return None
 
         # 2. Logic: Backscatter Analysis
         # We typically look for VV or VH polarization.
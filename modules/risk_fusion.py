@@ -0,0 +1,215 @@
+import math
+from datetime import datetime, timezone
+from typing import Dict, Optional, TYPE_CHECKING
+from src.database.db_manager import DBManager
+from src import instrumentation
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+
+# Relative importance of each sensor for the overall asset risk
+MODULE_WEIGHTS = {"VEG": 1.0, "GAS": 1.5, "THERMAL": 2.0, "GROUND": 1.5}
+SEVERITY_WEIGHTS = {"LOW": 1.0, "MEDIUM": 3.0, "HIGH": 10.0}
+SEVERITY_RANK = {"LOW": 1, "MEDIUM": 2, "HIGH": 3}
+
+# Detections further away than this from every asset are not attributed to any asset.
+# Coarse sensors (Sentinel-5P) get a larger reach than the 10-30 m optical/radar sensors.
+MAX_LINK_DISTANCE_M = {"VEG": 100, "GAS": 7000, "THERMAL": 300, "GROUND": 200}
+
+
+def _case(column: str, mapping: Dict[str, float], default: float = 0) -> str:
+    # Only validated weights reach this point (known keys, float values, see RiskFusion._weights)
+    whens = " ".join(f"WHEN '{key}' THEN {value}" for key, value in mapping.items())
+    return f"CASE {column} {whens} ELSE {default} END"
+
+
+class RiskFusion:
+    """
+    Fusion stage that runs after the four analysis engines. Attaches every
+    VEG/GAS/THERMAL/GROUND hotspot to its nearest infrastructure asset and keeps
+    the precomputed, indexed `asset_risk` table up to date.
+
+    Refreshes are incremental: only hotspots that were not linked yet are
+    spatially joined, and only assets whose hotspots changed since the last
+    refresh are re-scored. A changed infrastructure file triggers a full re-link.
+    """
+    def __init__(self, db: DBManager, module_weights: Optional[Dict[str, float]] = None,
+                 severity_weights: Optional[Dict[str, float]] = None):
+        self.db = db
+        self.module_weights = self._weights(MODULE_WEIGHTS, module_weights)
+        self.severity_weights = self._weights(SEVERITY_WEIGHTS, severity_weights)
+
+    @staticmethod
+    def _weights(defaults: Dict[str, float], overrides: Optional[Dict[str, float]]) -> Dict[str, float]:
+        """
+        Merges weight overrides into the defaults. The weights are inlined into the
+        scoring SQL, so only the known keys and numeric values are accepted.
+        """
+        unknown = set(overrides or {}) - set(defaults)
+        if unknown:
+            raise ValueError(f"Unknown weight keys {sorted(unknown)}, expected a subset of {sorted(defaults)}")
+        weights = {key: float(value) for key, value in {**defaults, **(overrides or {})}.items()}
+        # 'inf'/'nan' pass float() but are not valid SQL literals
+        invalid = {key: value for key, value in weights.items() if not (math.isfinite(value) and value >= 0)}
+        if invalid:
+            raise ValueError(f"Weights must be finite and non-negative, got {invalid}")
+        return weights
+
+    @staticmethod
+    def _prepare_assets(infra_gdf: "gpd.GeoDataFrame") -> "gpd.GeoDataFrame":
+        """
+        Derives a stable asset id, type and representative point for every feature.
+        """
+        assets = infra_gdf.reset_index()
+        for id_column in ("osmid", "id"):
+            if id_column in assets.columns:
+                ids = assets[id_column].astype(str)
+                # OSM ids are only unique per element type (node/way/relation)
+                for element_column in ("element", "element_type"):
+                    if element_column in assets.columns:
+                        ids = assets[element_column].astype(str) + "/" + ids
+                        break
+                break
+        else:
+            ids = assets.index.astype(str)
+
+        assets = assets.assign(
+            asset_id=ids.values,
+            asset_type=assets["power"].astype(str) if "power" in assets.columns else assets.geometry.geom_type,
+        )
+        return assets[["asset_id", "asset_type", "geometry"]].drop_duplicates("asset_id")
+
+    def _sync_assets(self, conn, project_name: str, assets: "gpd.GeoDataFrame") -> bool:
+        """
+        Stores the project's assets. Returns True if assets were added, moved or removed
+        since the last refresh (i.e. the infrastructure file changed).
+        """
+        points = assets.to_crs(4326).representative_point()
+        rows = {
+            a_id: (a_type, p.y, p.x)
+            for a_id, a_type, p in zip(assets["asset_id"], assets["asset_type"], points)
+        }
+        existing = {
+            row[0]: tuple(row[1:])
+            for row in conn.execute("SELECT asset_id, asset_type, latitude, longitude FROM assets WHERE project_name = ?", (project_name,))
+        }
+        changed = [a_id for a_id, row in rows.items() if existing.get(a_id) != row]
+        removed = [(project_name, a_id) for a_id in existing.keys() - rows.keys()]
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO assets (project_name, asset_id, asset_type, latitude, longitude) VALUES (?, ?, ?, ?, ?)",
+            [(project_name, a_id) + rows[a_id] for a_id in changed]
+        )
+        conn.executemany("DELETE FROM assets WHERE project_name = ? AND asset_id = ?", removed)
+        conn.executemany("DELETE FROM asset_risk WHERE project_name = ? AND asset_id = ?", removed)
+        return bool(changed or removed)
+
+    def _link_new_results(self, conn, project_name: str, assets: "gpd.GeoDataFrame", relink_all: bool = False) -> int:
+        """
+        Spatially joins hotspots without an asset link to their nearest asset.
+        With `relink_all` every hotspot of the project is joined again, including
+        the ones that were out of reach of the previous infrastructure.
+        """
+        import geopandas as gpd
+        import pandas as pd
+
+        new_results = pd.read_sql_query(f"""
+            SELECT r.id, r.module_type, r.latitude, r.longitude FROM analysis_results AS r
+            LEFT JOIN result_asset_links AS l ON l.result_id = r.id
+            WHERE r.project_name = ? AND r.latitude IS NOT NULL {"" if relink_all else "AND l.result_id IS NULL"}
+        """, conn, params=[project_name])
+        if new_results.empty:
+            return 0
+
+        # Distances are computed in a local metric CRS
+        points = gpd.GeoDataFrame(
+            new_results,
+            geometry=gpd.points_from_xy(new_results["longitude"], new_results["latitude"]),
+            crs="EPSG:4326",
+        )
+        metric_crs = points.estimate_utm_crs()
+        joined = gpd.sjoin_nearest(
+            points.to_crs(metric_crs),
+            assets.to_crs(metric_crs),
+            how="left",
+            max_distance=max(MAX_LINK_DISTANCE_M.values()),
+            distance_col="distance_m",
+        ).drop_duplicates("id")
+
+        links = []
+        for row in joined.itertuples():
+            reach = MAX_LINK_DISTANCE_M.get(row.module_type, 0)
+            in_reach = pd.notna(row.asset_id) and row.distance_m <= reach
+            links.append((row.id, project_name, row.asset_id if in_reach else None, row.distance_m if in_reach else None))
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO result_asset_links (result_id, project_name, asset_id, distance_m) VALUES (?, ?, ?, ?)",
+            links
+        )
+        return len(links)
+
+    def _rescore(self, conn, project_name: str, since: Optional[str], now: str) -> int:
+        """
+        Recomputes the risk rows of all assets whose hotspots changed after `since`
+        (all assets of the project on the first refresh).
+        """
+        active = "r.status = 'ACTIVE'"
+        score = f"{_case('r.module_type', self.module_weights)} * {_case('r.severity', self.severity_weights)}"
+        rank = _case("r.severity", SEVERITY_RANK)
+        counts = ", ".join(
+            f"SUM(CASE WHEN {active} AND r.module_type = '{module}' THEN 1 ELSE 0 END)"
+            for module in ("VEG", "GAS", "THERMAL", "GROUND")
+        )
+
+        if since is None:
+            affected = "SELECT asset_id FROM assets WHERE project_name = :project"
+        else:
+            affected = """
+            SELECT DISTINCT l.asset_id FROM analysis_results AS r
+            JOIN result_asset_links AS l ON l.result_id = r.id
+            WHERE r.project_name = :project AND r.updated_at >= :since AND l.asset_id IS NOT NULL
+            """
+
+        query = f"""
+        INSERT OR REPLACE INTO asset_risk (project_name, asset_id, asset_type, latitude, longitude, risk_score,
+                                           veg_hotspots, gas_hotspots, thermal_hotspots, ground_hotspots,
+                                           max_severity, updated_at)
+        SELECT a.project_name, a.asset_id, a.asset_type, a.latitude, a.longitude,
+               COALESCE(SUM(CASE WHEN {active} THEN {score} END), 0),
+               {counts},
+               CASE MAX(CASE WHEN {active} THEN {rank} END) WHEN 3 THEN 'HIGH' WHEN 2 THEN 'MEDIUM' WHEN 1 THEN 'LOW' END,
+               :now
+        FROM assets AS a
+        LEFT JOIN result_asset_links AS l ON l.project_name = a.project_name AND l.asset_id = a.asset_id
+        LEFT JOIN analysis_results AS r ON r.id = l.result_id
+        WHERE a.project_name = :project AND a.asset_id IN ({affected})
+        GROUP BY a.project_name, a.asset_id
+        """
+        return conn.execute(query, {"project": project_name, "since": since, "now": now}).rowcount
+
+    def run_fusion(self, project_name: str, infra_gdf: "gpd.GeoDataFrame") -> Dict[str, int]:
+        """
+        Incrementally refreshes the asset risk view of a project.
+        If the infrastructure changed, all hotspots are re-linked and all assets re-scored.
+        :return: number of newly linked hotspots and re-scored assets
+        """
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+        assets = self._prepare_assets(infra_gdf)
+
+        with self.db._get_results_connection(project_name, create=True) as conn:
+            row = conn.execute("SELECT refreshed_at FROM fusion_state WHERE project_name = ?", (project_name,)).fetchone()
+            since = row[0] if row else None
+
+            with instrumentation.span("fusion.assets"):
+                infrastructure_changed = self._sync_assets(conn, project_name, assets)
+            if infrastructure_changed:
+                since = None
+            with instrumentation.span("fusion.link"):
+                linked = self._link_new_results(conn, project_name, assets, relink_all=infrastructure_changed)
+            with instrumentation.span("fusion.score"):
+                rescored = self._rescore(conn, project_name, since, now)
+
+            conn.execute("INSERT OR REPLACE INTO fusion_state (project_name, refreshed_at) VALUES (?, ?)", (project_name, now))
+
+        instrumentation.increment("rows_written", linked + rescored)
+        return {"linked": linked, "rescored": rescored}
@@ -3,7 +3,10 @@ import stackstac
 import xarray as xr
 import geopandas as gpd
 from src.clients.stac_client import STACClient
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+# Two months of Landsat passes for the initial analysis
+DEFAULT_SEARCH_WINDOW = "2026-01-01/2026-02-28"
 
 class ThermalAlert:
     """
@@ -13,9 +16,12 @@ class ThermalAlert:
     def __init__(self, stac_client: STACClient):
         self.stac_client = stac_client
 
-    def run_analysis(self, project_name: str, infra_gdf: gpd.GeoDataFrame) -> List[Dict]:
+    def run_analysis(self, project_name: str, infra_gdf: gpd.GeoDataFrame,
+                     search_window: Optional[str] = None) -> Optional[List[Dict]]:
         """
         Calculates Land Surface Temperature (LST) and searches for thermal hotspots.
+        :param search_window: STAC datetime range "start/end" (default: DEFAULT_SEARCH_WINDOW)
+        :return: detections, or None if no imagery was found
         """
         results = []
         bbox = list(infra_gdf.total_bounds)
@@ -24,14 +30,14 @@ class ThermalAlert:
         # Collection: landsat-c2-l2
         items = self.stac_client.search_imagery(
             bbox=bbox,
-            datetime="2026-01-01/2026-02-28",
+            datetime=search_window or DEFAULT_SEARCH_WINDOW,
             collections=["landsat-c2-l2"],
             cloud_cover=15
         )
 
         if not items:
             print(f"No thermal imagery found for {project_name}")
-            return results
+            return None
 
         # 2. Logic: Extract Thermal Band (ST_B10)
         # Note: Landsat Collection 2 Level-2 Surface Temperature is already
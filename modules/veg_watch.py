@@ -1,20 +1,57 @@
 import numpy as np
-import stackstac
 import xarray as xr
 import geopandas as gpd
 from src.clients.stac_client import STACClient
-from typing import Dict
+from src.compute import ComputeConfig, get_compute_config
+from src.processing.compositing import best_pixel_composite
+from src.processing.pyramid import ResolutionPyramid
+from src import instrumentation
+from typing import Dict, Optional
+
+# NDVI above which vegetation counts as dense, and the more permissive
+# threshold of the coarse screening pass (mixed pixels at 80 m read lower)
+NDVI_THRESHOLD = 0.6
+SCREEN_NDVI_THRESHOLD = 0.45
+
+# Initial analysis window; scheduled runs only search the scenes acquired since the last run
+DEFAULT_SEARCH_WINDOW = "2025-12-01/2026-02-28"
 
 class VegWatch:
     """
     Module for vegetation monitoring using Sentinel-2 NDVI.
     """
-    def __init__(self, stac_client: STACClient):
+    def __init__(self, stac_client: STACClient, compute_config: Optional[ComputeConfig] = None,
+                 max_scene_cloud_cover: int = 60, composite_method: str = "quality", two_pass: bool = True):
         self.stac_client = stac_client
+        self.compute_config = compute_config or get_compute_config()
+        # Clouds are masked per pixel (SCL), so partially cloudy scenes are still useful
+        self.max_scene_cloud_cover = max_scene_cloud_cover
+        self.composite_method = composite_method
+        # Coarse screening before full-resolution reads (see ResolutionPyramid)
+        self.two_pass = two_pass
+
+    def _ndvi(self, stack: xr.DataArray) -> xr.DataArray:
+        """
+        Lazy NDVI of the cloud-free best-pixel composite of a (time, band, y, x) stack.
+        """
+        composite = best_pixel_composite(
+            stack.sel(band=["B04", "B08"]),
+            stack.sel(band="SCL"),
+            method=self.composite_method
+        )
+        red = composite.sel(band="B04")
+        nir = composite.sel(band="B08")
+        return (nir - red) / (nir + red)
+
+    def _screen(self, coarse_stack: xr.DataArray) -> xr.DataArray:
+        return self._ndvi(coarse_stack) > SCREEN_NDVI_THRESHOLD
 
-    def run_analysis(self, project_name: str, infra_gdf: gpd.GeoDataFrame) -> list:
+    def run_analysis(self, project_name: str, infra_gdf: gpd.GeoDataFrame,
+                     search_window: Optional[str] = None) -> Optional[list]:
         """
         Executes vegetation analysis for the given infrastructure.
+        :param search_window: STAC datetime range "start/end" (default: DEFAULT_SEARCH_WINDOW)
+        :return: detections, or None if no imagery was found
         """
         results = []
 
@@ -22,34 +59,52 @@ class VegWatch:
         # Format: [minx, miny, maxx, maxy]
         bbox = list(infra_gdf.total_bounds)
 
-        # 2. Search for the latest Sentinel-2 imagery (cloud-free)
+        # 2. Search for the latest Sentinel-2 imagery
         # We search for the last 3 months to ensure we get a good image
         items = self.stac_client.search_imagery(
             bbox=bbox,
-            datetime="2025-12-01/2026-02-28", # Dynamic range would be better
+            datetime=search_window or DEFAULT_SEARCH_WINDOW,
             collections=["sentinel-2-l2a"],
-            cloud_cover=10
+            cloud_cover=self.max_scene_cloud_cover
         )
 
         if not items:
             print(f"No suitable imagery found for {project_name}")
-            return results
+            return None
 
-        # 3. Load Red (B04) and NIR (B08) bands using stackstac
-        # We use a small area around our infrastructure
-        stack = stackstac.stack(items, assets=["B04", "B08"], bounds_latlon=bbox)
-
-        # Calculate median over time to remove remaining artifacts/clouds
-        composite = stack.median(dim="time").compute()
+        # 3. Load Red (B04), NIR (B08) and the Scene Classification (SCL) using stackstac
+        # For large areas a coarse screening pass on the COG overviews selects the
+        # tiles that may contain dense vegetation; only those are read at 10 m.
+        pyramid = ResolutionPyramid(self.compute_config)
+        stack, windows = pyramid.read(
+            items,
+            assets=["B04", "B08", "SCL"],
+            bbox=bbox,
+            collection="sentinel-2-l2a",
+            # SCL is delivered at 20 m, so the common output grid has to be given explicitly
+            resolution=10,
+            screen_fn=self._screen if self.two_pass else None
+        )
 
-        # 4. Calculate NDVI
-        red = composite.sel(band="B04")
-        nir = composite.sel(band="B08")
-        ndvi = (nir - red) / (nir + red)
+        # 4. Best-pixel composite and NDVI per candidate tile: cloud/shadow pixels are
+        # masked via SCL and one valid observation is picked per pixel
+        tile_counts = []
+        for y_slice, x_slice in windows:
+            tile = stack.isel(y=y_slice, x=x_slice)
+            ndvi = self._ndvi(tile)
+            # 5. Intersect with infrastructure (Simplified logic)
+            # We look for high NDVI values (> 0.6) near our lines
+            tile_counts.append((ndvi > NDVI_THRESHOLD).sum())
+            instrumentation.increment("pixels_processed", ndvi.size)
 
-        # 5. Intersect with infrastructure (Simplified logic)
-        # We look for high NDVI values (> 0.6) near our lines
-        high_veg = ndvi.where(ndvi > 0.6)
+        # All tiles are computed in one go so the scheduler can process them in parallel
+        # (this is where the COG reads actually happen)
+        with instrumentation.span("veg.cog_read_compute"):
+            tile_counts = self.compute_config.compute(*tile_counts) if tile_counts else ()
+        if len(windows) == 1:
+            tile_counts = (tile_counts,)
+        high_veg_pixels = int(sum(int(count) for count in tile_counts))
+        instrumentation.increment("high_ndvi_pixels", high_veg_pixels)
 
         # In a real scenario, we would use rasterio.features.shapes to convert
         # these pixels back to coordinates and check distance to lines.
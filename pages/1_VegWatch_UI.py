@@ -1,6 +1,4 @@
 import streamlit as st
-import leafmap.foliumap as leafmap
-import pandas as pd
 from pathlib import Path
 from src.database.db_manager import DBManager
 
@@ -8,7 +6,14 @@ from src.database.db_manager import DBManager
 st.set_page_config(page_title="VegWatch Analysis", layout="wide")
 
 DB_PATH = Path("data/system/global_registry.sqlite")
-db = DBManager(DB_PATH)
+
+
+@st.cache_resource
+def get_db() -> DBManager:
+    return DBManager(DB_PATH)
+
+
+db = get_db()
 
 st.title("🌿 VegWatch: Vegetation Monitoring")
 st.markdown("Detailed NDVI analysis and encroachment detection for power lines.")
@@ -25,7 +30,7 @@ if not project_list:
 selected_project = st.sidebar.selectbox("Switch Project", project_list)
 
 # --- LOAD DATA ---
-results_df = db.get_results_for_project(selected_project, module="VEG")
+results_df = db.get_results_for_project(selected_project, module="VEG", active_only=True)
 
 if results_df.empty:
     st.info(f"No vegetation anomalies found for project: {selected_project}")
@@ -49,6 +54,8 @@ else:
 
     with col_map:
         st.subheader("Interactive Hotspot Map")
+        # leafmap/folium are only loaded once there is a map to draw
+        import leafmap.foliumap as leafmap
 
         # Initialize the map centered on the first result
         m = leafmap.Map(
@@ -1,5 +1,4 @@
 import streamlit as st
-import leafmap.foliumap as leafmap
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -9,7 +8,14 @@ from src.database.db_manager import DBManager
 st.set_page_config(page_title="GasWatch Monitor", layout="wide")
 
 DB_PATH = Path("data/system/global_registry.sqlite")
-db = DBManager(DB_PATH)
+
+
+@st.cache_resource
+def get_db() -> DBManager:
+    return DBManager(DB_PATH)
+
+
+db = get_db()
 
 st.title("☁️ GasWatch: Methane Emission Tracking")
 st.markdown("Atmospheric monitoring of $CH_4$ concentrations using Sentinel-5P TROPOMI data.")
@@ -25,7 +31,7 @@ if not project_list:
 selected_project = st.sidebar.selectbox("Switch Project", project_list)
 
 # --- LOAD DATA ---
-results_df = db.get_results_for_project(selected_project, module="GAS")
+results_df = db.get_results_for_project(selected_project, module="GAS", active_only=True)
 
 if results_df.empty:
     st.info(f"No gas anomalies detected for project: {selected_project}")
@@ -61,6 +67,8 @@ else:
 
     with col_map:
         st.subheader("Plume Location Map")
+        # leafmap/folium are only loaded once there is a map to draw
+        import leafmap.foliumap as leafmap
         m = leafmap.Map(
             center=[results_df.iloc[0]['latitude'], results_df.iloc[0]['longitude']],
             zoom=12,
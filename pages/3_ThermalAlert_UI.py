@@ -1,6 +1,4 @@
 import streamlit as st
-import leafmap.foliumap as leafmap
-import pandas as pd
 from pathlib import Path
 from src.database.db_manager import DBManager
 
@@ -8,7 +6,14 @@ from src.database.db_manager import DBManager
 st.set_page_config(page_title="ThermalAlert Dashboard", layout="wide")
 
 DB_PATH = Path("data/system/global_registry.sqlite")
-db = DBManager(DB_PATH)
+
+
+@st.cache_resource
+def get_db() -> DBManager:
+    return DBManager(DB_PATH)
+
+
+db = get_db()
 
 st.title("🌡️ ThermalAlert: Infrastructure Heat Monitoring")
 st.markdown("Identification of thermal anomalies in substations and transformers using Landsat 8/9 TIRS.")
@@ -24,7 +29,7 @@ if not project_list:
 selected_project = st.sidebar.selectbox("Select Project", project_list)
 
 # --- LOAD THERMAL DATA ---
-results_df = db.get_results_for_project(selected_project, module="THERMAL")
+results_df = db.get_results_for_project(selected_project, module="THERMAL", active_only=True)
 
 if results_df.empty:
     st.info(f"No thermal anomalies detected in {selected_project}. All components operating within normal temperature ranges.")
@@ -46,6 +51,8 @@ else:
 
     with col_map:
         st.subheader("Anomalies Map (Landsat TIRS)")
+        # leafmap/folium are only loaded once there is a map to draw
+        import leafmap.foliumap as leafmap
 
         # Centering the map
         m = leafmap.Map(
@@ -1,6 +1,4 @@
 import streamlit as st
-import leafmap.foliumap as leafmap
-import pandas as pd
 from pathlib import Path
 from src.database.db_manager import DBManager
 
@@ -8,7 +6,14 @@ from src.database.db_manager import DBManager
 st.set_page_config(page_title="GroundGuard Monitoring", layout="wide")
 
 DB_PATH = Path("data/system/global_registry.sqlite")
-db = DBManager(DB_PATH)
+
+
+@st.cache_resource
+def get_db() -> DBManager:
+    return DBManager(DB_PATH)
+
+
+db = get_db()
 
 st.title("🛰️ GroundGuard: Ground Stability & Radar Analysis")
 st.markdown("Monitoring of ground subsidence and surface deformation using Sentinel-1 SAR (Synthetic Aperture Radar).")
@@ -24,7 +29,7 @@ if not project_list:
 selected_project = st.sidebar.selectbox("Select Project", project_list)
 
 # --- LOAD RADAR DATA ---
-results_df = db.get_results_for_project(selected_project, module="GROUND")
+results_df = db.get_results_for_project(selected_project, module="GROUND", active_only=True)
 
 if results_df.empty:
     st.info(f"No significant ground movement detected in {selected_project}. Infrastructure foundations appear stable.")
@@ -48,6 +53,8 @@ else:
 
     with col_map:
         st.subheader("Deformation Map")
+        # leafmap/folium are only loaded once there is a map to draw
+        import leafmap.foliumap as leafmap
 
         # Initialize map
         m = leafmap.Map(
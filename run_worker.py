@@ -1,19 +1,40 @@
+import os
+import sys
 import time
+import socket
+import sqlite3
 import logging
-import geopandas as gpd
+import argparse
+import importlib
 from pathlib import Path
+from typing import Optional
 
 # --- INTERNAL IMPORTS ---
+# Only lightweight modules are imported here. GeoPandas, the STAC stack and the
+# analysis engines are loaded on first use, so that worker startup and health
+# checks don't pay for the geospatial dependencies.
 from src.database.db_manager import DBManager
+from src.database.hotspot_tracker import HotspotTracker
+from modules.risk_fusion import RiskFusion
 from src.clients.osm_client import OSMClient
 from src.clients.stac_client import STACClient
+from src.compute import ComputeConfig, get_compute_config
+from src.scheduler import MonitoringScheduler
 from src.utils import get_project_dir
+from src import instrumentation
 
 # --- ANALYSIS MODULES ---
-from modules.veg_watch import VegWatch
-from modules.gas_watch import GasWatch
-from modules.thermal_alert import ThermalAlert
-from modules.ground_guard import GroundGuard
+# (module type, import path, class name, label) in execution order
+ENGINES = [
+    ("VEG", "modules.veg_watch", "VegWatch", "VegWatch (NDVI)"),
+    ("GAS", "modules.gas_watch", "GasWatch", "GasWatch (CH4)"),
+    ("THERMAL", "modules.thermal_alert", "ThermalAlert", "ThermalAlert (LST)"),
+    ("GROUND", "modules.ground_guard", "GroundGuard", "GroundGuard (Radar)"),
+]
+# Engines that process rasters with dask and take the shared ComputeConfig
+COMPUTE_ENGINES = {"VEG"}
+
+DB_PATH = Path("data/system/global_registry.sqlite")
 
 # Configure logging for professional backend monitoring
 logging.basicConfig(
@@ -22,80 +43,218 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+class EngineRegistry:
+    """
+    Imports and instantiates the analysis engines on first use and keeps
+    them for the lifetime of the worker.
+    """
+    def __init__(self, stac_client: STACClient, compute_config: ComputeConfig):
+        self.stac_client = stac_client
+        self.compute_config = compute_config
+        self._engines = {}
+
+    def get(self, module_type: str):
+        if module_type not in self._engines:
+            _, module_path, class_name, _ = next(e for e in ENGINES if e[0] == module_type)
+            with instrumentation.span("worker.engine_import"):
+                engine_cls = getattr(importlib.import_module(module_path), class_name)
+            if module_type in COMPUTE_ENGINES:
+                self._engines[module_type] = engine_cls(self.stac_client, self.compute_config)
+            else:
+                self._engines[module_type] = engine_cls(self.stac_client)
+        return self._engines[module_type]
+
+
+def load_infrastructure(project_name: str, paths: dict, osm: OSMClient):
+    """
+    Loads the project's infrastructure GeoJSON, falling back to an OSM download.
+    """
+    import geopandas as gpd
+
+    raw_file = paths["raw"] / "infrastructure.geojson"
+    if not raw_file.exists():
+        logger.info(f"[{project_name}] Fetching OSM data as fallback...")
+        gdf = osm.fetch_power_data(project_name)
+        osm.save_to_project(gdf, paths["raw"], "infrastructure")
+        return gdf
+    return gpd.read_file(raw_file)
+
+
+def run_module(project_name: str, module_type: str, gdf, engines: EngineRegistry, tracker: HotspotTracker,
+               search_window: Optional[str] = None) -> int:
+    """
+    Runs a single analysis engine and merges its detections into the hotspot table.
+    :param search_window: STAC datetime range to analyse (default: the engine's initial window)
+    """
+    label = next(e[3] for e in ENGINES if e[0] == module_type)
+    logger.info(f"[{project_name}] Executing {label}...")
+    engine = engines.get(module_type)
+    with instrumentation.span(f"worker.{module_type.lower()}"):
+        results = engine.run_analysis(project_name, gdf, search_window)
+    if results is None:
+        # No imagery in the search window: keep the existing hotspots as they are
+        logger.info(f"[{project_name}] {module_type}: no imagery found, hotspots left unchanged")
+        return 0
+    with instrumentation.span("worker.db_write"):
+        stats = tracker.track(project_name, module_type, results)
+    logger.info(f"[{project_name}] {module_type}: {stats['new']} new, {stats['updated']} recurring, "
+                f"{stats['resolved']} resolved hotspots")
+    return len(results)
+
+
+def run_fusion(project_name: str, gdf, fusion: RiskFusion):
+    logger.info(f"[{project_name}] Refreshing asset risk scores...")
+    with instrumentation.span("worker.fusion"):
+        fusion_stats = fusion.run_fusion(project_name, gdf)
+    logger.info(f"[{project_name}] {fusion_stats['linked']} hotspots linked, {fusion_stats['rescored']} assets re-scored")
+
+
+def run_scheduled_job(job: dict, db: DBManager, osm: OSMClient, stac: STACClient, engines: EngineRegistry,
+                      tracker: HotspotTracker, fusion: RiskFusion, scheduler: MonitoringScheduler):
+    """
+    Executes one recurring (project, module) job if a new acquisition is available.
+    """
+    project_name, module_type = job["project_name"], job["module_type"]
+    paths = get_project_dir(project_name)
+    run = None
+    try:
+        # The heartbeat keeps the lease alive however long the analysis takes
+        with scheduler.lease_heartbeat(job), instrumentation.track_run(project_name) as run:
+            with instrumentation.span("worker.ingest"):
+                gdf = load_infrastructure(project_name, paths, osm)
+
+            # Only pay for a full analysis when the satellite delivered something new
+            latest = stac.latest_acquisition(list(gdf.total_bounds), job["collection"])
+            if not scheduler.is_new_acquisition(job, latest):
+                logger.info(f"[{project_name}] {module_type}: no new {job['collection']} acquisition, deferring")
+                scheduler.defer_job(job)
+                return
+
+            # Analyse only the scenes acquired since the previous run
+            search_window = scheduler.search_window(job, latest)
+            run_module(project_name, module_type, gdf, engines, tracker, search_window)
+            run_fusion(project_name, gdf, fusion)
+
+        scheduler.complete_job(job, latest)
+        db.save_run_metrics(run.to_dict())
+        instrumentation.write_run_reports(run, paths["processed"])
+        logger.info(f"🔁 [{project_name}] Scheduled {module_type} run finished in {run.duration_seconds:.1f}s")
+
+    except Exception as e:
+        logger.error(f"❌ Scheduled {module_type} run failed for {project_name}: {str(e)}")
+        scheduler.fail_job(job)
+        if run is not None:
+            db.save_run_metrics(run.to_dict())
+
+
+def healthcheck() -> int:
+    """
+    Verifies that the registry database is reachable. The registry is opened
+    read-only, so the probe never creates, migrates or modifies it, and no
+    engine is loaded.
+    """
+    if not DB_PATH.is_file():
+        print(f"UNHEALTHY: registry {DB_PATH.resolve()} not found")
+        return 1
+    try:
+        conn = sqlite3.connect(f"{DB_PATH.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            pending = conn.execute("SELECT COUNT(*) FROM projects WHERE status = 'PENDING'").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"UNHEALTHY: {e}")
+        return 1
+    print(f"OK: registry reachable, {pending} pending project(s)")
+    return 0
+
+
 def main():
     # 1. Initialize System Infrastructure
     # Ensure the system directory exists for the global database
-    DB_PATH = Path("data/system/global_registry.sqlite")
     db = DBManager(DB_PATH)
+    tracker = HotspotTracker(db)
+    fusion = RiskFusion(db)
+    scheduler = MonitoringScheduler(db)
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+
+    # Projects completed before recurring monitoring existed get their schedules now
+    scheduler.ensure_schedules()
 
-    # Initialize API Clients
+    # Initialize API Clients (the STAC connection is opened on the first search)
     osm = OSMClient()
     stac = STACClient()
 
-    # 2. Initialize All 4 Analysis Engines
-    veg_watch = VegWatch(stac)
-    gas_watch = GasWatch(stac)
-    thermal_alert = ThermalAlert(stac)
-    ground_guard = GroundGuard(stac)
-
-    logger.info("Worker 4.0 (Full Suite) started. Polling for infrastructure projects...")
-
-    while True:
-        # Check for projects that need processing
-        pending_projects = db.get_pending_projects()
-
-        for project_name in pending_projects:
-            logger.info(f"🚀 Starting Full-Spectrum Analysis for: {project_name}")
-
-            try:
-                # Lock project by setting status to PROCESSING
-                db.update_project_status(project_name, "PROCESSING")
-                paths = get_project_dir(project_name)
-
-                # --- STEP A: Infrastructure Data Ingestion ---
-                raw_file = paths["raw"] / "infrastructure.geojson"
-                if not raw_file.exists():
-                    logger.info(f"[{project_name}] Fetching OSM data as fallback...")
-                    gdf = osm.fetch_power_data(project_name)
-                    osm.save_to_project(gdf, paths["raw"], "infrastructure")
-                else:
-                    gdf = gpd.read_file(raw_file)
-
-                # --- STEP B: Vegetation Monitoring (Sentinel-2) ---
-                logger.info(f"[{project_name}] Executing VegWatch (NDVI)...")
-                veg_results = veg_watch.run_analysis(project_name, gdf)
-                for res in veg_results:
-                    db.save_analysis_result(project_name, "VEG", res["lat"], res["lon"], res["severity"], res["description"])
-
-                # --- STEP C: Methane Emission Monitoring (Sentinel-5P) ---
-                logger.info(f"[{project_name}] Executing GasWatch (CH4)...")
-                gas_results = gas_watch.run_analysis(project_name, gdf)
-                for res in gas_results:
-                    db.save_analysis_result(project_name, "GAS", res["lat"], res["lon"], res["severity"], res["description"])
-
-                # --- STEP D: Thermal Anomaly Detection (Landsat 8/9) ---
-                logger.info(f"[{project_name}] Executing ThermalAlert (LST)...")
-                thermal_results = thermal_alert.run_analysis(project_name, gdf)
-                for res in thermal_results:
-                    db.save_analysis_result(project_name, "THERMAL", res["lat"], res["lon"], res["severity"], res["description"])
-
-                # --- STEP E: Ground Stability Monitoring (Sentinel-1 SAR) ---
-                logger.info(f"[{project_name}] Executing GroundGuard (Radar)...")
-                ground_results = ground_guard.run_analysis(project_name, gdf)
-                for res in ground_results:
-                    db.save_analysis_result(project_name, "GROUND", res["lat"], res["lon"], res["severity"], res["description"])
-
-                # --- STEP F: Finalization ---
-                db.update_project_status(project_name, "COMPLETED")
-                total_alerts = len(veg_results) + len(gas_results) + len(thermal_results) + len(ground_results)
-                logger.info(f"✅ {project_name} finished. Total hotspots archived: {total_alerts}")
-
-            except Exception as e:
-                logger.error(f"❌ Critical error in {project_name}: {str(e)}")
-                db.update_project_status(project_name, "FAILED")
-
-        # Cycle wait time
-        time.sleep(30)
+    # Shared dask scheduler, memory budget and chunking policy for the raster engines
+    compute_config = get_compute_config()
+
+    # 2. Register All 4 Analysis Engines (imported when the first project arrives)
+    engines = EngineRegistry(stac, compute_config)
+
+    logger.info(f"Worker 4.0 (Full Suite) started with dask scheduler '{compute_config.scheduler}' "
+                f"({compute_config.concurrent_tasks} parallel tasks). Polling for infrastructure projects...")
+
+    try:
+        while True:
+            # Check for projects that need processing
+            pending_projects = db.get_pending_projects()
+
+            for project_name in pending_projects:
+                # Full analyses share the STAC rate budgets with the recurring jobs
+                if not scheduler.reserve_full_run():
+                    logger.info(f"STAC rate budget exhausted, {project_name} waits for the next cycle")
+                    break
+
+                logger.info(f"🚀 Starting Full-Spectrum Analysis for: {project_name}")
+
+                run = None
+                try:
+                    # Lock project by setting status to PROCESSING
+                    db.update_project_status(project_name, "PROCESSING")
+                    paths = get_project_dir(project_name)
+                    total_alerts = 0
+
+                    with instrumentation.track_run(project_name) as run:
+                        # --- STEP A: Infrastructure Data Ingestion ---
+                        with instrumentation.span("worker.ingest"):
+                            gdf = load_infrastructure(project_name, paths, osm)
+
+                        # --- STEP B-E: Vegetation, Methane, Thermal and Ground Monitoring ---
+                        for module_type, _, _, _ in ENGINES:
+                            total_alerts += run_module(project_name, module_type, gdf, engines, tracker)
+
+                        # --- STEP F: Multi-Sensor Risk Fusion per Asset ---
+                        run_fusion(project_name, gdf, fusion)
+
+                    # --- STEP G: Finalization ---
+                    db.save_run_metrics(run.to_dict())
+                    instrumentation.write_run_reports(run, paths["processed"])
+                    db.update_project_status(project_name, "COMPLETED")
+                    scheduler.ensure_schedules(project_name)
+                    logger.info(f"✅ {project_name} finished in {run.duration_seconds:.1f}s. Total hotspots archived: {total_alerts}")
+
+                except Exception as e:
+                    logger.error(f"❌ Critical error in {project_name}: {str(e)}")
+                    db.update_project_status(project_name, "FAILED")
+                    if run is not None:
+                        db.save_run_metrics(run.to_dict())
+
+            # --- Recurring Monitoring: work through due jobs within the global limits ---
+            while (job := scheduler.claim_next_job(worker_id)) is not None:
+                run_scheduled_job(job, db, osm, stac, engines, tracker, fusion, scheduler)
+
+            # Cycle wait time
+            time.sleep(30)
+    finally:
+        # Shuts down a local distributed cluster together with the worker
+        compute_config.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mayil Vision background worker")
+    parser.add_argument("--healthcheck", action="store_true", help="Check the registry and exit")
+    args = parser.parse_args()
+
+    if args.healthcheck:
+        sys.exit(healthcheck())
     main()
\ No newline at end of file
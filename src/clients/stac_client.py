@@ -1,6 +1,5 @@
-import pystac_client
-import planetary_computer
 from typing import List, Optional
+from src import instrumentation
 
 class STACClient:
     """
@@ -8,11 +7,25 @@ class STACClient:
     """
     def __init__(self):
         self.api_url = "https://planetarycomputer.microsoft.com/api/stac/v1"
-        # The client needs to sign requests to access the data assets
-        self.client = pystac_client.Client.open(
-            self.api_url,
-            modifier=planetary_computer.sign_inplace
-        )
+        self._client = None
+
+    @property
+    def client(self):
+        """
+        The pystac client is opened on first use, so constructing a STACClient
+        neither imports the STAC stack nor touches the network.
+        """
+        if self._client is None:
+            import pystac_client
+            import planetary_computer
+
+            # The client needs to sign requests to access the data assets
+            with instrumentation.span("stac.open"):
+                self._client = pystac_client.Client.open(
+                    self.api_url,
+                    modifier=planetary_computer.sign_inplace
+                )
+        return self._client
 
     def search_imagery(self, bbox: List[float], datetime: str, collections: List[str], cloud_cover: int = 10):
         """
@@ -22,10 +35,30 @@ class STACClient:
         :param collections: e.g. ["sentinel-2-l2a"]
         :param cloud_cover: Max allowed cloud cover in percent
         """
-        search = self.client.search(
-            bbox=bbox,
-            datetime=datetime,
-            collections=collections,
-            query={"eo:cloud_cover": {"lt": cloud_cover}}
-        )
-        return search.item_collection()
\ No newline at end of file
+        with instrumentation.span(f"stac.search.{'+'.join(collections)}"):
+            search = self.client.search(
+                bbox=bbox,
+                datetime=datetime,
+                collections=collections,
+                query={"eo:cloud_cover": {"lt": cloud_cover}}
+            )
+            items = search.item_collection()
+        instrumentation.increment("items_searched", len(items))
+        return items
+
+    def latest_acquisition(self, bbox: List[float], collection: str) -> Optional[str]:
+        """
+        Returns the datetime (ISO 8601) of the newest scene of `collection` over the
+        bounding box, or None. A single sorted, one-item search - cheap enough to be
+        used by the scheduler before committing to a full analysis run.
+        """
+        with instrumentation.span(f"stac.latest.{collection}"):
+            search = self.client.search(
+                bbox=bbox,
+                collections=[collection],
+                sortby="-properties.datetime",
+                max_items=1
+            )
+            items = list(search.items())
+        instrumentation.increment("items_searched", len(items))
+        return items[0].datetime.isoformat() if items else None
@@ -0,0 +1,163 @@
+import os
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default spatial chunk size (pixels per side) used when stacking each collection
+DEFAULT_CHUNKSIZES = {
+    "sentinel-2-l2a": 2048,
+    "landsat-c2-l2": 1024,
+    "sentinel-1-grd": 2048,
+    "sentinel-5p-l2-netcdf": 512,
+}
+FALLBACK_CHUNKSIZE = 1024
+
+# Rough number of float64 copies of a chunk alive at once during a reduction
+# (source pixels, masks, intermediate results); used to size chunks to the RAM budget
+CHUNK_MEMORY_FACTOR = 8
+BYTES_PER_PIXEL = 8
+
+SCHEDULERS = ("threads", "processes", "distributed")
+
+
+def _total_memory() -> Optional[int]:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+class ComputeConfig:
+    """
+    Deployment-wide dask settings shared by the engines that stack and compute
+    rasters (currently VegWatch and the readers in src.processing).
+
+    Environment variables (see .env.example):
+      MAYIL_DASK_SCHEDULER            'threads' (default), 'processes' or 'distributed'
+      MAYIL_DASK_WORKERS              number of workers/threads (default: all cores)
+      MAYIL_DASK_THREADS_PER_WORKER   threads per distributed worker (default 1)
+      MAYIL_DASK_MEMORY_LIMIT         total RAM budget, e.g. '16GB' (default: 75% of host RAM)
+      MAYIL_DASK_SPILL_DIR            directory distributed workers spill to
+      MAYIL_CHUNKSIZE_<COLLECTION>    chunk size override, e.g. MAYIL_CHUNKSIZE_SENTINEL_2_L2A=1024
+    """
+    def __init__(self, scheduler: str = "threads", n_workers: Optional[int] = None,
+                 threads_per_worker: int = 1, memory_limit: Optional[int] = None,
+                 spill_dir: Optional[str] = None, chunksizes: Optional[Dict[str, int]] = None):
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f"Unknown dask scheduler '{scheduler}', expected one of {SCHEDULERS}")
+        self.scheduler = scheduler
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.threads_per_worker = threads_per_worker
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.chunksizes = {**DEFAULT_CHUNKSIZES, **(chunksizes or {})}
+        self._client = None
+
+    @classmethod
+    def from_env(cls) -> "ComputeConfig":
+        memory_limit = os.getenv("MAYIL_DASK_MEMORY_LIMIT")
+        if memory_limit:
+            from dask.utils import parse_bytes
+            memory_limit = parse_bytes(memory_limit)
+        else:
+            total = _total_memory()
+            memory_limit = int(total * 0.75) if total else None
+
+        chunksizes = {}
+        for collection in DEFAULT_CHUNKSIZES:
+            value = os.getenv(f"MAYIL_CHUNKSIZE_{collection.upper().replace('-', '_')}")
+            if value:
+                chunksizes[collection] = int(value)
+
+        workers = os.getenv("MAYIL_DASK_WORKERS")
+        return cls(
+            scheduler=os.getenv("MAYIL_DASK_SCHEDULER", "threads"),
+            n_workers=int(workers) if workers else None,
+            threads_per_worker=int(os.getenv("MAYIL_DASK_THREADS_PER_WORKER", "1")),
+            memory_limit=memory_limit,
+            spill_dir=os.getenv("MAYIL_DASK_SPILL_DIR") or None,
+            chunksizes=chunksizes,
+        )
+
+    @property
+    def concurrent_tasks(self) -> int:
+        if self.scheduler == "distributed":
+            return self.n_workers * self.threads_per_worker
+        return self.n_workers
+
+    def chunksize_for(self, collection: str, n_bands: int = 1) -> int:
+        """
+        Chunk size (pixels per side) for stacking `collection`. The configured
+        size is reduced if all concurrently processed chunks would not fit into
+        the memory budget.
+        """
+        chunksize = self.chunksizes.get(collection, FALLBACK_CHUNKSIZE)
+        if self.memory_limit:
+            per_task = self.memory_limit / self.concurrent_tasks
+            max_pixels = per_task / (CHUNK_MEMORY_FACTOR * BYTES_PER_PIXEL * max(n_bands, 1))
+            # Keep multiples of 256 so chunks stay aligned with the COG tiles
+            max_side = max(int(max_pixels ** 0.5) // 256 * 256, 256)
+            chunksize = min(chunksize, max_side)
+        return chunksize
+
+    def _get_client(self):
+        """
+        Lazily starts a LocalCluster (once per process) for the distributed scheduler.
+        """
+        if self._client is None:
+            try:
+                from dask.distributed import Client, LocalCluster
+            except ImportError as e:
+                raise ImportError("MAYIL_DASK_SCHEDULER=distributed requires 'dask[distributed]' to be installed.") from e
+            import dask
+
+            dask.config.set({
+                "distributed.worker.memory.target": 0.6,
+                "distributed.worker.memory.spill": 0.7,
+                "distributed.worker.memory.pause": 0.85,
+                "distributed.worker.memory.terminate": 0.95,
+            })
+            cluster = LocalCluster(
+                n_workers=self.n_workers,
+                threads_per_worker=self.threads_per_worker,
+                memory_limit=int(self.memory_limit / self.n_workers) if self.memory_limit else "auto",
+                local_directory=self.spill_dir,
+                processes=True,
+            )
+            self._client = Client(cluster)
+            logger.info(f"Started dask LocalCluster with {self.n_workers} workers: {self._client.dashboard_link}")
+        return self._client
+
+    def compute(self, *collections):
+        """
+        Computes dask-backed objects with the configured scheduler.
+        Returns a single result for a single input, a tuple otherwise.
+        """
+        import dask
+
+        if self.scheduler == "distributed":
+            results = dask.compute(*collections, scheduler=self._get_client())
+        else:
+            results = dask.compute(*collections, scheduler=self.scheduler, num_workers=self.n_workers)
+        return results[0] if len(collections) == 1 else results
+
+    def close(self):
+        if self._client is not None:
+            cluster = self._client.cluster
+            self._client.close()
+            cluster.close()
+            self._client = None
+
+
+_config: Optional[ComputeConfig] = None
+
+
+def get_compute_config() -> ComputeConfig:
+    """
+    Returns the process-wide compute configuration (read from the environment once).
+    """
+    global _config
+    if _config is None:
+        _config = ComputeConfig.from_env()
+    return _config
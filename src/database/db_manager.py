@@ -1,15 +1,29 @@
+import os
+import json
 import sqlite3
-import pandas as pd
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+from src import instrumentation
+from src.utils import get_project_dir
 
 class DBManager:
     """
     Handles all database operations for project tracking and analysis results.
     The database file is stored in the central data directory.
+
+    In sharded mode (sharded=True or MAYIL_STORAGE_MODE=sharded) only project
+    metadata and the job queue stay in this global registry. Detections, asset
+    risk and run metrics of each project go to its own
+    data/projects/<name>/processed/results.sqlite, so workers on different
+    projects don't contend on one file lock.
     """
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, sharded: Optional[bool] = None):
         self.db_path = db_path
+        if sharded is None:
+            sharded = os.getenv("MAYIL_STORAGE_MODE", "single").lower() == "sharded"
+        self.sharded = sharded
+        self._initialized_shards = set()
         # Ensure the directory for the database exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
@@ -17,6 +31,36 @@ class DBManager:
     def _get_connection(self):
         return sqlite3.connect(self.db_path)
 
+    def get_shard_path(self, project_name: str) -> Path:
+        return get_project_dir(project_name, create=False)["processed"] / "results.sqlite"
+
+    def _get_results_connection(self, project_name: str, create: bool = False):
+        """
+        Connection holding the results of `project_name`: the project database in
+        sharded mode, otherwise the registry.
+        Only write paths pass `create=True`. Reads of a project without a database
+        get an empty in-memory one, so they never create directories or files.
+        """
+        if not self.sharded:
+            return self._get_connection()
+
+        shard_path = self.get_shard_path(project_name)
+        if not shard_path.exists():
+            if not create:
+                conn = sqlite3.connect(":memory:")
+                self._init_results_schema(conn)
+                return conn
+            shard_path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(shard_path)
+        if shard_path not in self._initialized_shards:
+            # WAL lets dashboards read while the worker writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                self._init_results_schema(conn)
+            self._initialized_shards.add(shard_path)
+        return conn
+
     def _init_db(self):
         """
         Initializes the database schema if it doesn't exist.
@@ -26,9 +70,49 @@ class DBManager:
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT UNIQUE NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            status TEXT DEFAULT 'PENDING'
+            status TEXT DEFAULT 'PENDING',
+            priority INTEGER DEFAULT 0 -- higher runs first (e.g. critical substations)
         );
         """
+        # Recurring monitoring jobs per project and module (maintained by src.scheduler)
+        query_scheduler = [
+            """
+            CREATE TABLE IF NOT EXISTS schedules (
+                project_name TEXT NOT NULL,
+                module_type TEXT NOT NULL,
+                next_run_at TIMESTAMP,
+                last_run_at TIMESTAMP,
+                last_acquisition TIMESTAMP, -- datetime of the newest scene already analysed
+                status TEXT DEFAULT 'IDLE', -- 'IDLE', 'RUNNING'
+                lease_owner TEXT,
+                lease_expires_at TIMESTAMP,
+                PRIMARY KEY (project_name, module_type),
+                FOREIGN KEY (project_name) REFERENCES projects (name)
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_schedules_due ON schedules (status, next_run_at)",
+            """
+            CREATE TABLE IF NOT EXISTS rate_budgets (
+                collection TEXT PRIMARY KEY,
+                window_start TIMESTAMP,
+                used INTEGER DEFAULT 0
+            );
+            """,
+        ]
+        with self._get_connection() as conn:
+            conn.execute(query_projects)
+            if "priority" not in {row[1] for row in conn.execute("PRAGMA table_info(projects)")}:
+                conn.execute("ALTER TABLE projects ADD COLUMN priority INTEGER DEFAULT 0")
+            for query in query_scheduler:
+                conn.execute(query)
+            if not self.sharded:
+                self._init_results_schema(conn)
+
+    def _init_results_schema(self, conn: sqlite3.Connection):
+        """
+        Initializes the tables holding detections, asset risk and run metrics.
+        They live in the registry or, in sharded mode, in every project database.
+        """
         query_results = """
         CREATE TABLE IF NOT EXISTS analysis_results (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -38,21 +122,163 @@ class DBManager:
             longitude REAL,
             severity TEXT, -- 'LOW', 'MEDIUM', 'HIGH'
             description TEXT,
-            detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- first time the hotspot was seen
+            last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            occurrences INTEGER DEFAULT 1,
+            missed_runs INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'ACTIVE', -- 'ACTIVE', 'RESOLVED'
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- last change of any tracking field
             FOREIGN KEY (project_name) REFERENCES projects (name)
         );
         """
-        with self._get_connection() as conn:
-            conn.execute(query_projects)
-            conn.execute(query_results)
+        # Spatial index over the hotspot locations, kept in sync by triggers
+        query_results_index = [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS analysis_results_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)",
+            """
+            CREATE TRIGGER IF NOT EXISTS analysis_results_rtree_insert AFTER INSERT ON analysis_results
+            WHEN NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL
+            BEGIN
+                INSERT INTO analysis_results_rtree VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS analysis_results_rtree_delete AFTER DELETE ON analysis_results
+            BEGIN
+                DELETE FROM analysis_results_rtree WHERE id = OLD.id;
+            END
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_results_project_module ON analysis_results (project_name, module_type, status)",
+            "CREATE INDEX IF NOT EXISTS idx_results_project_updated ON analysis_results (project_name, updated_at)",
+        ]
+        # Per-asset risk view fusing all four sensors (maintained by modules.risk_fusion)
+        query_asset_risk = [
+            """
+            CREATE TABLE IF NOT EXISTS assets (
+                project_name TEXT NOT NULL,
+                asset_id TEXT NOT NULL,
+                asset_type TEXT, -- 'line', 'tower', 'substation', ...
+                latitude REAL,
+                longitude REAL,
+                PRIMARY KEY (project_name, asset_id)
+            );
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS result_asset_links (
+                result_id INTEGER PRIMARY KEY, -- analysis_results.id
+                project_name TEXT NOT NULL,
+                asset_id TEXT, -- NULL if no asset is within reach
+                distance_m REAL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_links_asset ON result_asset_links (project_name, asset_id)",
+            """
+            CREATE TABLE IF NOT EXISTS asset_risk (
+                project_name TEXT NOT NULL,
+                asset_id TEXT NOT NULL,
+                asset_type TEXT,
+                latitude REAL,
+                longitude REAL,
+                risk_score REAL DEFAULT 0,
+                veg_hotspots INTEGER DEFAULT 0,
+                gas_hotspots INTEGER DEFAULT 0,
+                thermal_hotspots INTEGER DEFAULT 0,
+                ground_hotspots INTEGER DEFAULT 0,
+                max_severity TEXT,
+                updated_at TIMESTAMP,
+                PRIMARY KEY (project_name, asset_id)
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_asset_risk_score ON asset_risk (project_name, risk_score DESC)",
+            """
+            CREATE TABLE IF NOT EXISTS fusion_state (
+                project_name TEXT PRIMARY KEY,
+                refreshed_at TIMESTAMP -- results changed after this are picked up by the next refresh
+            );
+            """,
+        ]
+        query_run_metrics = """
+        CREATE TABLE IF NOT EXISTS run_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT UNIQUE NOT NULL,
+            project_name TEXT NOT NULL,
+            started_at TIMESTAMP,
+            duration_seconds REAL,
+            status TEXT, -- 'COMPLETED', 'FAILED'
+            metrics TEXT, -- JSON document with spans and counters
+            FOREIGN KEY (project_name) REFERENCES projects (name)
+        );
+        """
+        conn.execute(query_results)
+        self._migrate_results_table(conn)
+        for query in query_results_index + query_asset_risk:
+            conn.execute(query)
+        conn.execute(query_run_metrics)
+
+    def _migrate_results_table(self, conn: sqlite3.Connection):
+        """
+        Adds the hotspot tracking columns to registries created before they existed,
+        merges the duplicates those registries accumulated and backfills the spatial index.
+        """
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(analysis_results)")}
+        new_columns = {
+            "last_seen": "TIMESTAMP",
+            "occurrences": "INTEGER DEFAULT 1",
+            "missed_runs": "INTEGER DEFAULT 0",
+            "status": "TEXT DEFAULT 'ACTIVE'",
+            "updated_at": "TIMESTAMP",
+        }
+        missing = [name for name in new_columns if name not in columns]
+        if not missing:
+            return
+        for name in missing:
+            conn.execute(f"ALTER TABLE analysis_results ADD COLUMN {name} {new_columns[name]}")
+        conn.execute("UPDATE analysis_results SET last_seen = COALESCE(last_seen, detected_at), updated_at = COALESCE(updated_at, last_seen, detected_at)")
+
+        # Without tracking, every run appended the same detections again. Rows of a module at
+        # identical coordinates become one hotspot that keeps the oldest id, the first and last
+        # detection time, the number of runs and the latest severity/description.
+        duplicates = conn.execute("""
+            SELECT project_name, module_type, latitude, longitude,
+                   MIN(id), MAX(id), MIN(detected_at), MAX(detected_at), COUNT(*)
+            FROM analysis_results WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+            GROUP BY project_name, module_type, latitude, longitude HAVING COUNT(*) > 1
+        """).fetchall()
+        for project_name, module, lat, lon, keep_id, newest_id, first_seen, last_seen, count in duplicates:
+            conn.execute("""
+                UPDATE analysis_results
+                SET detected_at = ?, last_seen = ?, updated_at = ?, occurrences = ?,
+                    severity = (SELECT severity FROM analysis_results WHERE id = ?),
+                    description = (SELECT description FROM analysis_results WHERE id = ?)
+                WHERE id = ?
+            """, (first_seen, last_seen, last_seen, count, newest_id, newest_id, keep_id))
+            conn.execute("""
+                DELETE FROM analysis_results
+                WHERE project_name = ? AND module_type = ? AND latitude = ? AND longitude = ? AND id != ?
+            """, (project_name, module, lat, lon, keep_id))
 
-    def register_project(self, name: str):
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS analysis_results_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)")
+        conn.execute("""
+            INSERT OR IGNORE INTO analysis_results_rtree
+            SELECT id, latitude, latitude, longitude, longitude FROM analysis_results
+            WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        """)
+
+    def register_project(self, name: str, priority: int = 0):
         """
         Registers a new project in the system.
+        Projects with a higher priority are scheduled first.
+        """
+        query = "INSERT OR IGNORE INTO projects (name, status, priority) VALUES (?, 'PENDING', ?)"
+        with self._get_connection() as conn:
+            conn.execute(query, (name, priority))
+
+    def set_project_priority(self, name: str, priority: int):
         """
-        query = "INSERT OR IGNORE INTO projects (name, status) VALUES (?, 'PENDING')"
+        Changes the scheduling priority of a project.
+        """
+        query = "UPDATE projects SET priority = ? WHERE name = ?"
         with self._get_connection() as conn:
-            conn.execute(query, (name,))
+            conn.execute(query, (priority, name))
 
     def update_project_status(self, name: str, status: str):
         """
@@ -62,11 +288,31 @@ class DBManager:
         with self._get_connection() as conn:
             conn.execute(query, (status, name))
 
+    def delete_project(self, name: str):
+        """
+        Removes a project from the registry together with all of its results.
+        In sharded mode the results are dropped by deleting the project database file.
+        """
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM schedules WHERE project_name = ?", (name,))
+            conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+
+        if self.sharded:
+            shard_path = self.get_shard_path(name)
+            for path in (shard_path, Path(f"{shard_path}-wal"), Path(f"{shard_path}-shm")):
+                path.unlink(missing_ok=True)
+            self._initialized_shards.discard(shard_path)
+        else:
+            with self._get_connection() as conn:
+                for table in ("analysis_results", "result_asset_links", "assets", "asset_risk", "fusion_state", "run_metrics"):
+                    conn.execute(f"DELETE FROM {table} WHERE project_name = ?", (name,))
+
     def get_pending_projects(self):
         """
-        Returns a list of projects that are waiting for processing.
+        Returns a list of projects that are waiting for processing,
+        highest priority first, then in order of registration.
         """
-        query = "SELECT name FROM projects WHERE status = 'PENDING'"
+        query = "SELECT name FROM projects WHERE status = 'PENDING' ORDER BY priority DESC, id ASC"
         with self._get_connection() as conn:
             return [row[0] for row in conn.execute(query).fetchall()]
 
@@ -78,14 +324,18 @@ class DBManager:
         INSERT INTO analysis_results (project_name, module_type, latitude, longitude, severity, description)
         VALUES (?, ?, ?, ?, ?, ?)
         """
-        with self._get_connection() as conn:
+        with self._get_results_connection(project_name, create=True) as conn:
             conn.execute(query, (project_name, module, lat, lon, sev, desc))
+        instrumentation.increment("rows_written")
 
-    def get_results_for_project(self, project_name: str, module: str = None):
+    def get_results_for_project(self, project_name: str, module: str = None, active_only: bool = False):
         """
         Fetches results for a specific project, optionally filtered by module.
+        With `active_only`, hotspots that have been resolved are left out.
         Returns a Pandas DataFrame for easy use in Streamlit.
         """
+        import pandas as pd
+
         query = "SELECT * FROM analysis_results WHERE project_name = ?"
         params = [project_name]
 
@@ -93,5 +343,115 @@ class DBManager:
             query += " AND module_type = ?"
             params.append(module)
 
-        with self._get_connection() as conn:
-            return pd.read_sql_query(query, conn, params=params)
\ No newline at end of file
+        if active_only:
+            query += " AND status = 'ACTIVE'"
+
+        with self._get_results_connection(project_name) as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def iter_results(self, project_name: str, modules: Optional[Sequence[str]] = None,
+                     severities: Optional[Sequence[str]] = None, bbox: Optional[Sequence[float]] = None,
+                     since: Optional[str] = None, until: Optional[str] = None, active_only: bool = False,
+                     chunksize: int = 50_000) -> Iterator[List[dict]]:
+        """
+        Streams the results of a project in chunks of `chunksize` rows (as dicts),
+        so that arbitrarily large exports run in constant memory.
+        :param bbox: [min_lon, min_lat, max_lon, max_lat], resolved through the R*Tree index
+        :param since: only hotspots seen at or after this timestamp
+        :param until: only hotspots first detected at or before this timestamp
+                      (a date without time includes the whole day)
+        """
+        query = "SELECT * FROM analysis_results WHERE project_name = ?"
+        params = [project_name]
+
+        if modules:
+            query += f" AND module_type IN ({', '.join('?' * len(modules))})"
+            params.extend(modules)
+        if severities:
+            query += f" AND severity IN ({', '.join('?' * len(severities))})"
+            params.extend(severities)
+        if bbox:
+            # The R*Tree stores float32 boxes rounded outward, so it only pre-selects
+            # candidates by overlap; the exact coordinates decide about the box edges
+            query += """ AND id IN (
+                SELECT id FROM analysis_results_rtree
+                WHERE max_lon >= ? AND min_lon <= ? AND max_lat >= ? AND min_lat <= ?
+            ) AND longitude BETWEEN ? AND ? AND latitude BETWEEN ? AND ?"""
+            params.extend([bbox[0], bbox[2], bbox[1], bbox[3]] * 2)
+        # Stored timestamps use a space separator, ISO input may use 'T'
+        if since:
+            query += " AND last_seen >= ?"
+            params.append(since.replace("T", " "))
+        if until:
+            if len(until) == 10:
+                query += " AND detected_at < date(?, '+1 day')"
+            else:
+                query += " AND detected_at <= ?"
+            params.append(until.replace("T", " "))
+        if active_only:
+            query += " AND status = 'ACTIVE'"
+        query += " ORDER BY id"
+
+        conn = self._get_results_connection(project_name)
+        try:
+            cursor = conn.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                yield [dict(zip(columns, row)) for row in rows]
+        finally:
+            conn.close()
+
+    def save_run_metrics(self, metrics: dict):
+        """
+        Persists the instrumentation summary of a single project run.
+        """
+        query = """
+        INSERT OR REPLACE INTO run_metrics (run_id, project_name, started_at, duration_seconds, status, metrics)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """
+        with self._get_results_connection(metrics["project_name"], create=True) as conn:
+            conn.execute(query, (
+                metrics["run_id"], metrics["project_name"], metrics["started_at"],
+                metrics["duration_seconds"], metrics["status"], json.dumps(metrics)
+            ))
+
+    def get_run_metrics(self, project_name: str, limit: int = 20) -> list:
+        """
+        Returns the instrumentation summaries of the most recent runs of a project
+        (newest first) as dictionaries.
+        """
+        query = "SELECT metrics FROM run_metrics WHERE project_name = ? ORDER BY started_at DESC LIMIT ?"
+        with self._get_results_connection(project_name) as conn:
+            return [json.loads(row[0]) for row in conn.execute(query, (project_name, limit)).fetchall()]
+
+
+    def get_top_risk_assets(self, project_name: str, limit: int = 100):
+        """
+        Returns the riskiest assets of a project from the precomputed asset_risk table.
+        """
+        import pandas as pd
+
+        query = """
+        SELECT * FROM asset_risk WHERE project_name = ? AND risk_score > 0
+        ORDER BY risk_score DESC LIMIT ?
+        """
+        with self._get_results_connection(project_name) as conn:
+            return pd.read_sql_query(query, conn, params=[project_name, limit])
+
+    def get_asset_detections(self, project_name: str, asset_id: str):
+        """
+        Returns all hotspots attached to a single asset (drilldown of the risk view).
+        """
+        import pandas as pd
+
+        query = """
+        SELECT r.*, l.distance_m FROM result_asset_links AS l
+        JOIN analysis_results AS r ON r.id = l.result_id
+        WHERE l.project_name = ? AND l.asset_id = ?
+        ORDER BY r.status, r.last_seen DESC
+        """
+        with self._get_results_connection(project_name) as conn:
+            return pd.read_sql_query(query, conn, params=[project_name, asset_id])
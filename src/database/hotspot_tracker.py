@@ -0,0 +1,118 @@
+import math
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from src.database.db_manager import DBManager
+from src import instrumentation
+
+# Distance (meters) within which a new detection is considered the same hotspot.
+# Roughly one to a few native pixels of the underlying sensor.
+MATCH_TOLERANCE_M = {
+    "VEG": 30,        # Sentinel-2, 10 m
+    "GAS": 7000,      # Sentinel-5P, 5.5 x 7 km
+    "THERMAL": 100,   # Landsat TIRS, 100 m (resampled to 30 m)
+    "GROUND": 50,     # Sentinel-1 GRD, 10-20 m
+}
+DEFAULT_TOLERANCE_M = 50
+
+# A hotspot is resolved once it was missing from this many consecutive runs.
+# More than one run avoids closing hotspots because of a single empty search.
+MISSED_RUNS_TO_RESOLVE = 2
+
+METERS_PER_DEGREE = 111_320
+
+
+class HotspotTracker:
+    """
+    Upserts detections into `analysis_results` instead of appending them.
+
+    Every detection is matched against the project's existing hotspots of the
+    same module via the R*Tree index. Matches update last_seen/occurrences,
+    unmatched detections become new hotspots and hotspots that stop being
+    reported are resolved after MISSED_RUNS_TO_RESOLVE runs.
+    """
+    def __init__(self, db: DBManager, tolerances_m: Optional[Dict[str, float]] = None,
+                 missed_runs_to_resolve: int = MISSED_RUNS_TO_RESOLVE):
+        self.db = db
+        self.tolerances_m = {**MATCH_TOLERANCE_M, **(tolerances_m or {})}
+        self.missed_runs_to_resolve = missed_runs_to_resolve
+
+    @staticmethod
+    def _distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        # Equirectangular approximation, accurate enough at hotspot tolerances
+        x = math.radians(lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+        y = math.radians(lat2 - lat1)
+        return math.hypot(x, y) * 6_371_000
+
+    def track(self, project_name: str, module: str, detections: Optional[List[Dict]]) -> Dict[str, int]:
+        """
+        Merges the detections of one module run into the hotspot table.
+        :param detections: engine results with lat, lon, severity and description, or None
+                           if the engine found no imagery. Such a run says nothing about the
+                           existing hotspots, so it does not count as a missed run.
+        :return: number of new, updated and resolved hotspots
+        """
+        stats = {"new": 0, "updated": 0, "resolved": 0}
+        if detections is None:
+            return stats
+
+        tolerance = self.tolerances_m.get(module, DEFAULT_TOLERANCE_M)
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+        matched = set()
+
+        candidate_query = """
+        SELECT r.id, r.latitude, r.longitude FROM analysis_results_rtree AS idx
+        JOIN analysis_results AS r ON r.id = idx.id
+        WHERE idx.min_lat <= ? AND idx.max_lat >= ? AND idx.min_lon <= ? AND idx.max_lon >= ?
+          AND r.project_name = ? AND r.module_type = ?
+        """
+        update_query = """
+        UPDATE analysis_results
+        SET last_seen = ?, updated_at = ?, occurrences = occurrences + 1, missed_runs = 0, status = 'ACTIVE',
+            severity = ?, description = ?
+        WHERE id = ?
+        """
+        insert_query = """
+        INSERT INTO analysis_results (project_name, module_type, latitude, longitude, severity, description,
+                                      detected_at, last_seen, updated_at, occurrences, missed_runs, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1, 0, 'ACTIVE')
+        """
+
+        with self.db._get_results_connection(project_name, create=True) as conn:
+            for det in detections:
+                lat, lon = float(det["lat"]), float(det["lon"])
+                dlat = tolerance / METERS_PER_DEGREE
+                dlon = tolerance / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+                candidates = conn.execute(candidate_query, (
+                    lat + dlat, lat - dlat, lon + dlon, lon - dlon, project_name, module
+                )).fetchall()
+
+                # Nearest hotspot within tolerance that was not already claimed in this run
+                best_id, best_dist = None, tolerance
+                for hotspot_id, h_lat, h_lon in candidates:
+                    dist = self._distance_m(lat, lon, h_lat, h_lon)
+                    if hotspot_id not in matched and dist <= best_dist:
+                        best_id, best_dist = hotspot_id, dist
+
+                if best_id is not None:
+                    conn.execute(update_query, (now, now, det["severity"], det["description"], best_id))
+                    matched.add(best_id)
+                    stats["updated"] += 1
+                else:
+                    cursor = conn.execute(insert_query, (
+                        project_name, module, lat, lon, det["severity"], det["description"], now, now, now
+                    ))
+                    matched.add(cursor.lastrowid)
+                    stats["new"] += 1
+
+            # Close out hotspots that were not reported in this run
+            conn.execute("""
+                UPDATE analysis_results SET missed_runs = missed_runs + 1
+                WHERE project_name = ? AND module_type = ? AND status = 'ACTIVE' AND last_seen < ?
+            """, (project_name, module, now))
+            stats["resolved"] = conn.execute("""
+                UPDATE analysis_results SET status = 'RESOLVED', updated_at = ?
+                WHERE project_name = ? AND module_type = ? AND status = 'ACTIVE' AND missed_runs >= ?
+            """, (now, project_name, module, self.missed_runs_to_resolve)).rowcount
+
+        instrumentation.increment("rows_written", stats["new"] + stats["updated"])
+        return stats
@@ -0,0 +1,131 @@
+import json
+import struct
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+from src.database.db_manager import DBManager
+from src import instrumentation
+
+# Output formats by file suffix
+FORMATS = {
+    ".parquet": "geoparquet",
+    ".geoparquet": "geoparquet",
+    ".fgb": "flatgeobuf",
+    ".ndjson": "geojsonseq",
+    ".geojsonl": "geojsonseq",
+    ".geojsons": "geojsonseq",
+}
+
+# Exported attributes (coordinates go into the geometry)
+PROPERTIES = [
+    "id", "project_name", "module_type", "severity", "description",
+    "detected_at", "last_seen", "occurrences", "status",
+]
+
+
+def _point_wkb(lon: float, lat: float) -> bytes:
+    # Little-endian WKB Point: byte order, geometry type 1, x, y
+    return struct.pack("<BIdd", 1, 1, lon, lat)
+
+
+def _write_geojsonseq(chunks: Iterator[List[dict]], output_path: Path) -> int:
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for rows in chunks:
+            for row in rows:
+                feature = {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [row["longitude"], row["latitude"]]},
+                    "properties": {key: row.get(key) for key in PROPERTIES},
+                }
+                f.write(json.dumps(feature) + "\n")
+            count += len(rows)
+    return count
+
+
+def _write_geoparquet(chunks: Iterator[List[dict]], output_path: Path) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    geo_metadata = {
+        "version": "1.0.0",
+        "primary_column": "geometry",
+        "columns": {"geometry": {"encoding": "WKB", "geometry_types": ["Point"]}},
+    }
+    schema = pa.schema(
+        [
+            ("id", pa.int64()), ("project_name", pa.string()), ("module_type", pa.string()),
+            ("severity", pa.string()), ("description", pa.string()), ("detected_at", pa.string()),
+            ("last_seen", pa.string()), ("occurrences", pa.int64()), ("status", pa.string()),
+            ("geometry", pa.binary()),
+        ],
+        metadata={b"geo": json.dumps(geo_metadata).encode("utf-8")},
+    )
+
+    count = 0
+    # One row group per chunk keeps memory bounded by the chunk size
+    with pq.ParquetWriter(str(output_path), schema, compression="zstd") as writer:
+        for rows in chunks:
+            columns = {key: [row.get(key) for row in rows] for key in PROPERTIES}
+            columns["geometry"] = [_point_wkb(row["longitude"], row["latitude"]) for row in rows]
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            count += len(rows)
+    return count
+
+
+def _write_flatgeobuf(chunks: Iterator[List[dict]], output_path: Path) -> int:
+    import fiona
+
+    schema = {
+        "geometry": "Point",
+        "properties": {
+            "id": "int", "project_name": "str", "module_type": "str", "severity": "str",
+            "description": "str", "detected_at": "str", "last_seen": "str",
+            "occurrences": "int", "status": "str",
+        },
+    }
+    count = 0
+    # Without a spatial index the FlatGeobuf driver streams features straight to disk
+    with fiona.open(output_path, "w", driver="FlatGeobuf", schema=schema, crs="EPSG:4326", SPATIAL_INDEX="NO") as dst:
+        for rows in chunks:
+            dst.writerecords(
+                {
+                    "geometry": {"type": "Point", "coordinates": (row["longitude"], row["latitude"])},
+                    "properties": {key: row.get(key) for key in PROPERTIES},
+                }
+                for row in rows
+            )
+            count += len(rows)
+    return count
+
+
+WRITERS = {
+    "geojsonseq": _write_geojsonseq,
+    "geoparquet": _write_geoparquet,
+    "flatgeobuf": _write_flatgeobuf,
+}
+
+
+def export_results(db: DBManager, project_name: str, output_path: Path, fmt: Optional[str] = None,
+                   modules: Optional[Sequence[str]] = None, severities: Optional[Sequence[str]] = None,
+                   bbox: Optional[Sequence[float]] = None, since: Optional[str] = None,
+                   until: Optional[str] = None, active_only: bool = False, chunksize: int = 50_000) -> int:
+    """
+    Streams the results of a project from SQLite into a GeoParquet, FlatGeobuf or
+    newline-delimited GeoJSON file. Rows are read and written chunk by chunk, so
+    memory use does not depend on the number of exported rows.
+    :param fmt: 'geoparquet', 'flatgeobuf' or 'geojsonseq' (inferred from the suffix if omitted)
+    :return: number of exported rows
+    """
+    output_path = Path(output_path)
+    fmt = fmt or FORMATS.get(output_path.suffix.lower())
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format for '{output_path.name}', expected one of {sorted(WRITERS)}")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    chunks = db.iter_results(
+        project_name, modules=modules, severities=severities, bbox=bbox,
+        since=since, until=until, active_only=active_only, chunksize=chunksize
+    )
+    with instrumentation.span(f"export.{fmt}"):
+        count = WRITERS[fmt](chunks, output_path)
+    return count
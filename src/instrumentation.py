@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import uuid
+import cProfile
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Prefix used for every exported Prometheus metric
+METRIC_PREFIX = "mayil"
+
+
+class RunMetrics:
+    """
+    Collects timing spans and counters for a single project run.
+    Spans are aggregated by name (call count, total and max duration),
+    counters are plain accumulating numbers (items searched, pixels processed,
+    rows written, ...). Bytes read from the COGs are not counted: the reads happen
+    inside GDAL, which does not report transferred bytes back to rasterio.
+    """
+    def __init__(self, project_name: str, run_id: Optional[str] = None, started_at: Optional[str] = None):
+        self.project_name = project_name
+        self.run_id = run_id or uuid.uuid4().hex
+        self.started_at = started_at or datetime.now(timezone.utc).isoformat()
+        self.duration_seconds = 0.0
+        self.status = "RUNNING"
+        self.spans: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, duration: float):
+        """
+        Records one execution of the stage `name` that took `duration` seconds.
+        """
+        with self._lock:
+            span = self.spans.setdefault(name, {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            span["calls"] += 1
+            span["total_seconds"] += duration
+            span["max_seconds"] = max(span["max_seconds"], duration)
+
+    def increment(self, name: str, value: float = 1):
+        """
+        Adds `value` to the counter `name`.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "project_name": self.project_name,
+            "started_at": self.started_at,
+            "duration_seconds": self.duration_seconds,
+            "status": self.status,
+            "spans": self.spans,
+            "counters": self.counters,
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the run in the Prometheus text exposition format
+        (e.g. for the node_exporter textfile collector).
+        All values describe the last run only and are replaced by the next one,
+        so they are exported as gauges.
+        """
+        project = self.project_name.replace("\\", "\\\\").replace('"', '\\"')
+        lines = [
+            f"# HELP {METRIC_PREFIX}_run_duration_seconds Wall-clock duration of the last project run.",
+            f"# TYPE {METRIC_PREFIX}_run_duration_seconds gauge",
+            f'{METRIC_PREFIX}_run_duration_seconds{{project="{project}",status="{self.status}"}} {self.duration_seconds:.6f}',
+            f"# HELP {METRIC_PREFIX}_stage_seconds Time spent per pipeline stage in the last run.",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds gauge",
+        ]
+        for name, span in sorted(self.spans.items()):
+            lines.append(f'{METRIC_PREFIX}_stage_seconds{{project="{project}",stage="{name}"}} {span["total_seconds"]:.6f}')
+        lines += [
+            f"# HELP {METRIC_PREFIX}_stage_calls Number of executions per pipeline stage in the last run.",
+            f"# TYPE {METRIC_PREFIX}_stage_calls gauge",
+        ]
+        for name, span in sorted(self.spans.items()):
+            lines.append(f'{METRIC_PREFIX}_stage_calls{{project="{project}",stage="{name}"}} {span["calls"]}')
+        for name, value in sorted(self.counters.items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f'{metric}{{project="{project}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+# The run currently being recorded by this process (the worker handles one project at a time)
+_active_run: Optional[RunMetrics] = None
+
+
+@contextmanager
+def span(name: str):
+    """
+    Times the enclosed block and records it on the active run.
+    Outside of a run the block is executed without any bookkeeping.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run = _active_run
+        if run is not None:
+            run.add_span(name, time.perf_counter() - start)
+
+
+def increment(name: str, value: float = 1):
+    """
+    Increments a counter on the active run (no-op outside of a run).
+    """
+    run = _active_run
+    if run is not None:
+        run.increment(name, value)
+
+
+@contextmanager
+def track_run(project_name: str):
+    """
+    Records all spans and counters emitted while processing `project_name`.
+
+    Profiling is opt-in via environment variables:
+      MAYIL_PROFILE_DIR          directory for cProfile dumps (enables profiling)
+      MAYIL_PROFILE_MIN_SECONDS  only keep profiles of runs slower than this (default 60)
+    The resulting .prof files can be opened with pstats, snakeviz or converted to
+    speedscope/flamegraph format for comparison with py-spy recordings.
+    """
+    global _active_run
+    run = RunMetrics(project_name)
+    profile_dir = os.getenv("MAYIL_PROFILE_DIR")
+    profiler = cProfile.Profile() if profile_dir else None
+
+    _active_run = run
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield run
+        run.status = "COMPLETED"
+    except Exception:
+        run.status = "FAILED"
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+        run.duration_seconds = time.perf_counter() - start
+        _active_run = None
+
+        if profiler and run.duration_seconds >= float(os.getenv("MAYIL_PROFILE_MIN_SECONDS", "60")):
+            out_dir = Path(profile_dir)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            out_file = out_dir / f"{project_name}_{run.run_id}.prof"
+            profiler.dump_stats(str(out_file))
+            logger.info(f"Slow run profile written to {out_file}")
+
+
+def write_run_reports(run: RunMetrics, output_dir: Path):
+    """
+    Exports the run as `run_metrics.json` and `run_metrics.prom` into `output_dir`
+    (usually the project's processed folder).
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "run_metrics.json").write_text(run.to_json(), encoding="utf-8")
+    (output_dir / "run_metrics.prom").write_text(run.to_prometheus(), encoding="utf-8")
@@ -0,0 +1,83 @@
+import numpy as np
+import xarray as xr
+
+# Sentinel-2 L2A Scene Classification Layer (SCL) classes
+SCL_NO_DATA = 0
+SCL_SATURATED = 1
+SCL_DARK_AREA = 2
+SCL_CLOUD_SHADOW = 3
+SCL_VEGETATION = 4
+SCL_NOT_VEGETATED = 5
+SCL_WATER = 6
+SCL_UNCLASSIFIED = 7
+SCL_CLOUD_MEDIUM = 8
+SCL_CLOUD_HIGH = 9
+SCL_THIN_CIRRUS = 10
+SCL_SNOW = 11
+
+# Quality rank per SCL class used for best-pixel selection (0 = never use the observation).
+# Clear land/water is preferred over unclassified pixels, snow and dark areas are a last resort.
+SCL_QUALITY = np.zeros(256, dtype=np.int16)
+SCL_QUALITY[[SCL_VEGETATION, SCL_NOT_VEGETATED, SCL_WATER]] = 3
+SCL_QUALITY[SCL_UNCLASSIFIED] = 2
+SCL_QUALITY[[SCL_DARK_AREA, SCL_SNOW]] = 1
+
+COMPOSITE_METHODS = ("quality", "recent")
+
+
+def _select_best(values: np.ndarray, scl: np.ndarray, method: str) -> np.ndarray:
+    """
+    Per-pixel selection on a single chunk.
+    values: (..., time, band), scl: (..., time) -> (..., band)
+    """
+    classes = np.nan_to_num(scl, nan=SCL_NO_DATA).astype(np.uint8)
+    quality = SCL_QUALITY[classes]
+    valid = quality > 0
+
+    # Observations are sorted by time, so the index doubles as a recency rank
+    recency = np.arange(classes.shape[-1], dtype=np.int32)
+    if method == "quality":
+        score = quality.astype(np.int32) * classes.shape[-1] + recency
+    else:
+        score = np.broadcast_to(recency, classes.shape)
+    score = np.where(valid, score, -1)
+
+    best = score.argmax(axis=-1)
+    out = np.take_along_axis(values, best[..., None, None], axis=-2)[..., 0, :]
+    # Pixels without a single valid observation stay empty
+    return np.where(valid.any(axis=-1)[..., None], out, np.nan)
+
+
+def best_pixel_composite(stack: xr.DataArray, scl: xr.DataArray, method: str = "quality") -> xr.DataArray:
+    """
+    Builds a cloud-free composite by picking one observation per pixel instead of
+    a temporal median. Cloud, cloud shadow, cirrus, saturated and no-data pixels
+    (according to the Sentinel-2 SCL band) are never selected.
+
+    :param stack: reflectance bands with dims (time, band, y, x)
+    :param scl: scene classification with dims (time, y, x)
+    :param method: "quality" picks the best SCL class (most recent on ties),
+                   "recent" picks the most recent valid observation
+    :return: composite with dims (band, y, x)
+    """
+    if method not in COMPOSITE_METHODS:
+        raise ValueError(f"Unknown composite method '{method}', expected one of {COMPOSITE_METHODS}")
+
+    stack = stack.sortby("time")
+    scl = scl.sortby("time")
+    if stack.chunks is not None:
+        # Each spatial chunk needs its full time series; the reduction then streams chunk by chunk
+        stack = stack.chunk({"time": -1, "band": -1})
+        scl = scl.chunk({"time": -1})
+
+    composite = xr.apply_ufunc(
+        _select_best,
+        stack,
+        scl,
+        kwargs={"method": method},
+        input_core_dims=[["time", "band"], ["time"]],
+        output_core_dims=[["band"]],
+        dask="parallelized",
+        output_dtypes=[np.result_type(stack.dtype, np.float32)],
+    )
+    return composite.transpose("band", ...)
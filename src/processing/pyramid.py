@@ -0,0 +1,100 @@
+import math
+import numpy as np
+import stackstac
+import xarray as xr
+from pyproj import Transformer
+from typing import Callable, List, Optional, Sequence, Tuple
+from src.compute import ComputeConfig
+from src import instrumentation
+
+# Native ground sampling distance (meters) of the full-resolution pass
+NATIVE_RESOLUTION = {
+    "sentinel-2-l2a": 10,
+    "landsat-c2-l2": 30,
+    "sentinel-1-grd": 10,
+}
+
+# The screening pass reads at native resolution x COARSE_FACTOR, which GDAL
+# serves from the COG overviews (e.g. 80 m for Sentinel-2)
+COARSE_FACTOR = 8
+
+Window = Tuple[slice, slice]
+
+
+class ResolutionPyramid:
+    """
+    Two-pass raster reader for large areas.
+
+    Pass 1 stacks the scenes at a coarse resolution and evaluates a cheap
+    screening function that flags candidate pixels. Pass 2 returns the lazy
+    full-resolution stack together with the windows (one per dask chunk) that
+    contain candidates, so only those tiles are ever fetched and analysed.
+
+    Both grids share the same snapped bounds, so coarse pixel (i, j) covers the
+    fine pixels [i*f:(i+1)*f, j*f:(j+1)*f] and every tile is exactly one chunk.
+    """
+    def __init__(self, compute_config: ComputeConfig, coarse_factor: int = COARSE_FACTOR):
+        self.compute_config = compute_config
+        self.coarse_factor = coarse_factor
+
+    def _grid(self, items, bbox: Sequence[float], coarse_resolution: float) -> Tuple[int, List[float]]:
+        """
+        Common CRS (of the first scene) and bounds snapped outward to the coarse grid.
+        """
+        epsg = items[0].properties["proj:epsg"]
+        minx, miny, maxx, maxy = Transformer.from_crs(4326, epsg, always_xy=True).transform_bounds(*bbox)
+        snap = coarse_resolution
+        return epsg, [
+            math.floor(minx / snap) * snap, math.floor(miny / snap) * snap,
+            math.ceil(maxx / snap) * snap, math.ceil(maxy / snap) * snap,
+        ]
+
+    def read(self, items, assets: List[str], bbox: Sequence[float], collection: str,
+             screen_fn: Optional[Callable[[xr.DataArray], xr.DataArray]] = None,
+             resolution: Optional[float] = None) -> Tuple[xr.DataArray, List[Window]]:
+        """
+        :param screen_fn: maps the coarse stack (time, band, y, x) to a boolean (y, x)
+                          candidate mask; it should be permissive, misses are not recovered.
+                          Without it every tile is returned (single full-resolution pass).
+        :return: lazy full-resolution stack and the candidate windows to analyse
+        """
+        fine_resolution = resolution or NATIVE_RESOLUTION.get(collection, 10)
+        coarse_resolution = fine_resolution * self.coarse_factor
+        epsg, bounds = self._grid(items, bbox, coarse_resolution)
+
+        # Tiles are whole chunks of the fine stack and a whole number of coarse pixels
+        chunksize = self.compute_config.chunksize_for(collection, n_bands=len(assets) * len(items))
+        tile_px = max(chunksize // self.coarse_factor, 1) * self.coarse_factor
+
+        fine = stackstac.stack(
+            items, assets=assets, bounds=bounds, epsg=epsg,
+            resolution=fine_resolution, chunksize=tile_px
+        )
+        height, width = fine.sizes["y"], fine.sizes["x"]
+        all_windows = [
+            (slice(y, min(y + tile_px, height)), slice(x, min(x + tile_px, width)))
+            for y in range(0, height, tile_px) for x in range(0, width, tile_px)
+        ]
+        if screen_fn is None or len(all_windows) <= 1:
+            # Small areas: screening would cost more than it saves
+            return fine, all_windows
+
+        # --- Pass 1: coarse screening from the overviews ---
+        with instrumentation.span("pyramid.screen"):
+            coarse = stackstac.stack(
+                items, assets=assets, bounds=bounds, epsg=epsg,
+                resolution=coarse_resolution, chunksize=chunksize
+            )
+            candidates = np.asarray(self.compute_config.compute(screen_fn(coarse).fillna(False)), dtype=bool)
+
+        # --- Pass 2: keep the tiles that contain at least one candidate ---
+        windows = [
+            (y_slice, x_slice) for y_slice, x_slice in all_windows
+            if candidates[
+                y_slice.start // self.coarse_factor: -(-y_slice.stop // self.coarse_factor),
+                x_slice.start // self.coarse_factor: -(-x_slice.stop // self.coarse_factor)
+            ].any()
+        ]
+        instrumentation.increment("tiles_screened", len(all_windows))
+        instrumentation.increment("tiles_selected", len(windows))
+        return fine, windows
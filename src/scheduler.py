@@ -0,0 +1,280 @@
+import os
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from src.database.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+# Collection searched by each module and its revisit time (hours)
+MODULE_SCHEDULES = {
+    "VEG": {"collection": "sentinel-2-l2a", "interval_hours": 5 * 24},
+    "GAS": {"collection": "sentinel-5p-l2-netcdf", "interval_hours": 24},
+    "THERMAL": {"collection": "landsat-c2-l2", "interval_hours": 16 * 24},
+    "GROUND": {"collection": "sentinel-1-grd", "interval_hours": 6 * 24},
+}
+
+# If the expected acquisition has not arrived yet, look again after this many hours
+RECHECK_HOURS = 6
+# Back-off after a failed job
+RETRY_HOURS = 1
+# A job whose worker did not report back within this time is handed out again
+LEASE_MINUTES = 60
+# Running jobs renew their lease this often, so long runs are not handed out twice
+HEARTBEAT_MINUTES = 15
+
+# STAC requests per collection and hour across all workers (override with MAYIL_RATE_BUDGET_<COLLECTION>)
+DEFAULT_RATE_BUDGETS = {
+    "sentinel-2-l2a": 120,
+    "sentinel-5p-l2-netcdf": 120,
+    "landsat-c2-l2": 60,
+    "sentinel-1-grd": 60,
+}
+# Every job performs an availability check and the engine's own search
+REQUESTS_PER_JOB = 2
+# The initial full analysis of a project runs one search per engine and collection
+REQUESTS_PER_FULL_RUN = 1
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# RFC 3339 timestamps for STAC datetime ranges
+STAC_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _fmt(value: datetime) -> str:
+    return value.strftime(TIME_FORMAT)
+
+
+def _parse(value: str) -> datetime:
+    # Accepts both SQLite timestamps and ISO 8601 acquisition datetimes
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class MonitoringScheduler:
+    """
+    Drives recurring monitoring runs per project and module on top of the registry.
+
+    Each (project, module) pair has a schedule row with its next run time. Due
+    jobs are leased to workers by project priority, then by due time, as long as
+    the global concurrency limit and the hourly request budget of the module's
+    STAC collection allow it. After a run the next run time follows the revisit
+    cycle of the newest acquisition, so runs line up with new satellite passes.
+
+    Environment variables:
+      MAYIL_MAX_CONCURRENT_JOBS        jobs running at the same time across all workers (default 4)
+      MAYIL_RATE_BUDGET_<COLLECTION>   STAC requests per hour, e.g. MAYIL_RATE_BUDGET_SENTINEL_2_L2A=120
+    """
+    def __init__(self, db: DBManager, max_concurrent_jobs: Optional[int] = None,
+                 rate_budgets: Optional[Dict[str, int]] = None):
+        self.db = db
+        self.max_concurrent_jobs = max_concurrent_jobs or int(os.getenv("MAYIL_MAX_CONCURRENT_JOBS", "4"))
+        self.rate_budgets = dict(DEFAULT_RATE_BUDGETS)
+        for collection in self.rate_budgets:
+            value = os.getenv(f"MAYIL_RATE_BUDGET_{collection.upper().replace('-', '_')}")
+            if value:
+                self.rate_budgets[collection] = int(value)
+        self.rate_budgets.update(rate_budgets or {})
+
+    def ensure_schedules(self, project_name: Optional[str] = None):
+        """
+        Creates the schedules of a completed project (or of all completed projects).
+        The first recurring run is due one revisit cycle after the initial analysis.
+        """
+        now = _now()
+        query = """
+        INSERT OR IGNORE INTO schedules (project_name, module_type, next_run_at)
+        SELECT name, ?, ? FROM projects WHERE status = 'COMPLETED'
+        """
+        params = []
+        if project_name:
+            query += " AND name = ?"
+            params.append(project_name)
+
+        with self.db._get_connection() as conn:
+            for module, spec in MODULE_SCHEDULES.items():
+                next_run = _fmt(now + timedelta(hours=spec["interval_hours"]))
+                conn.execute(query, [module, next_run] + params)
+
+    def _consume_budget(self, conn, collection: str, cost: int, now: datetime) -> bool:
+        """
+        Fixed one-hour window rate limit shared by all workers through the registry.
+        """
+        limit = self.rate_budgets.get(collection)
+        if limit is None:
+            return True
+
+        row = conn.execute("SELECT window_start, used FROM rate_budgets WHERE collection = ?", (collection,)).fetchone()
+        if row is None or _parse(row[0]) <= now - timedelta(hours=1):
+            window_start, used = _fmt(now), 0
+        else:
+            window_start, used = row
+
+        if used + cost > limit:
+            return False
+        conn.execute(
+            "INSERT OR REPLACE INTO rate_budgets (collection, window_start, used) VALUES (?, ?, ?)",
+            (collection, window_start, used + cost)
+        )
+        return True
+
+    def claim_next_job(self, worker_id: str) -> Optional[Dict]:
+        """
+        Leases the most important due job to `worker_id`.
+        Returns None if nothing is due or all limits are exhausted.
+        """
+        now = _now()
+        with self.db._get_connection() as conn:
+            # Serialize claims of concurrent workers on the registry file
+            conn.execute("BEGIN IMMEDIATE")
+
+            # Hand out jobs of crashed workers again
+            conn.execute(
+                "UPDATE schedules SET status = 'IDLE', lease_owner = NULL WHERE status = 'RUNNING' AND lease_expires_at < ?",
+                (_fmt(now),)
+            )
+
+            running = conn.execute("SELECT COUNT(*) FROM schedules WHERE status = 'RUNNING'").fetchone()[0]
+            if running >= self.max_concurrent_jobs:
+                return None
+
+            due = conn.execute("""
+                SELECT s.project_name, s.module_type, s.last_acquisition FROM schedules AS s
+                JOIN projects AS p ON p.name = s.project_name
+                WHERE s.status = 'IDLE' AND s.next_run_at <= ? AND p.status = 'COMPLETED'
+                ORDER BY p.priority DESC, s.next_run_at ASC
+            """, (_fmt(now),)).fetchall()
+
+            for project_name, module, last_acquisition in due:
+                collection = MODULE_SCHEDULES[module]["collection"]
+                if not self._consume_budget(conn, collection, REQUESTS_PER_JOB, now):
+                    continue
+                conn.execute("""
+                    UPDATE schedules SET status = 'RUNNING', lease_owner = ?, lease_expires_at = ?
+                    WHERE project_name = ? AND module_type = ?
+                """, (worker_id, _fmt(now + timedelta(minutes=LEASE_MINUTES)), project_name, module))
+                return {
+                    "project_name": project_name,
+                    "module_type": module,
+                    "collection": collection,
+                    "last_acquisition": last_acquisition,
+                    "worker_id": worker_id,
+                }
+        return None
+
+    def reserve_full_run(self) -> bool:
+        """
+        Charges the searches of a project's initial full analysis against the hourly
+        budgets of all collections. Either every collection has room and all of them
+        are charged, or nothing is charged and the project has to wait.
+        """
+        now = _now()
+        with self.db._get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for spec in MODULE_SCHEDULES.values():
+                if not self._consume_budget(conn, spec["collection"], REQUESTS_PER_FULL_RUN, now):
+                    conn.rollback()
+                    return False
+        return True
+
+    def is_new_acquisition(self, job: Dict, latest_acquisition: Optional[str]) -> bool:
+        """
+        True if `latest_acquisition` is newer than the last scene analysed for the job.
+        """
+        if latest_acquisition is None:
+            return False
+        if job["last_acquisition"] is None:
+            return True
+        return _parse(latest_acquisition) > _parse(job["last_acquisition"])
+
+    def search_window(self, job: Dict, latest_acquisition: str) -> str:
+        """
+        STAC datetime range of the scenes a job has not analysed yet: everything after
+        the last analysed acquisition up to `latest_acquisition`. The first recurring
+        run searches one revisit cycle back from `latest_acquisition`.
+        """
+        end = _parse(latest_acquisition)
+        if job["last_acquisition"]:
+            start = _parse(job["last_acquisition"]) + timedelta(microseconds=1)
+        else:
+            start = end - timedelta(hours=MODULE_SCHEDULES[job["module_type"]]["interval_hours"])
+        return f"{start.strftime(STAC_TIME_FORMAT)}/{end.strftime(STAC_TIME_FORMAT)}"
+
+    def renew_lease(self, job: Dict) -> bool:
+        """
+        Extends the lease of a running job by LEASE_MINUTES.
+        Returns False if the worker no longer holds the lease.
+        """
+        query = """
+        UPDATE schedules SET lease_expires_at = ?
+        WHERE project_name = ? AND module_type = ? AND lease_owner = ? AND status = 'RUNNING'
+        """
+        expires = _fmt(_now() + timedelta(minutes=LEASE_MINUTES))
+        with self.db._get_connection() as conn:
+            cursor = conn.execute(query, (expires, job["project_name"], job["module_type"], job["worker_id"]))
+        return cursor.rowcount == 1
+
+    @contextmanager
+    def lease_heartbeat(self, job: Dict):
+        """
+        Renews the lease of `job` every HEARTBEAT_MINUTES from a background thread
+        while the enclosed block (the actual analysis) is running.
+        """
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(HEARTBEAT_MINUTES * 60):
+                try:
+                    if not self.renew_lease(job):
+                        logger.warning(f"Lease of {job['project_name']}/{job['module_type']} was lost")
+                        return
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not renew lease of {job['project_name']}/{job['module_type']}: {e}")
+
+        thread = threading.Thread(target=beat, name=f"lease-{job['project_name']}-{job['module_type']}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _release(self, job: Dict, next_run: datetime, last_acquisition: Optional[str], ran: bool):
+        query = f"""
+        UPDATE schedules
+        SET status = 'IDLE', lease_owner = NULL, lease_expires_at = NULL, next_run_at = ?,
+            last_acquisition = COALESCE(?, last_acquisition){", last_run_at = ?" if ran else ""}
+        WHERE project_name = ? AND module_type = ? AND lease_owner = ?
+        """
+        params = [_fmt(next_run), last_acquisition] + ([_fmt(_now())] if ran else [])
+        params += [job["project_name"], job["module_type"], job["worker_id"]]
+        with self.db._get_connection() as conn:
+            released = conn.execute(query, params).rowcount
+        if not released:
+            logger.warning(f"{job['worker_id']} no longer holds the lease of {job['project_name']}/{job['module_type']}, "
+                           f"result of this run not recorded in the schedule")
+
+    def complete_job(self, job: Dict, latest_acquisition: str):
+        """
+        Marks a job as done; the next run is due one revisit cycle after the analysed scene.
+        """
+        interval = timedelta(hours=MODULE_SCHEDULES[job["module_type"]]["interval_hours"])
+        next_run = max(_parse(latest_acquisition) + interval, _now() + timedelta(hours=RECHECK_HOURS))
+        self._release(job, next_run, latest_acquisition, ran=True)
+
+    def defer_job(self, job: Dict):
+        """
+        No new acquisition yet: check again after RECHECK_HOURS.
+        """
+        self._release(job, _now() + timedelta(hours=RECHECK_HOURS), None, ran=False)
+
+    def fail_job(self, job: Dict):
+        self._release(job, _now() + timedelta(hours=RETRY_HOURS), None, ran=False)
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from src.processing.compositing import (
+    SCL_CLOUD_HIGH, SCL_CLOUD_MEDIUM, SCL_CLOUD_SHADOW, SCL_NOT_VEGETATED,
+    SCL_UNCLASSIFIED, SCL_VEGETATION, _select_best, best_pixel_composite,
+)
+
+
+def _pixel(scl_series, method):
+    """
+    Runs the selection on a single pixel whose band values encode the time index
+    (observation t has values [t, 10 + t]).
+    """
+    n = len(scl_series)
+    values = np.stack([np.arange(n), 10 + np.arange(n)], axis=-1).astype(float)[None]
+    scl = np.asarray(scl_series, dtype=float)[None]
+    return _select_best(values, scl, method)[0]
+
+
+@pytest.mark.parametrize("method", ["quality", "recent"])
+def test_cloudy_newest_scene_is_skipped(method):
+    out = _pixel([SCL_VEGETATION, SCL_NOT_VEGETATED, SCL_CLOUD_HIGH], method)
+    np.testing.assert_array_equal(out, [1, 11])
+
+
+def test_quality_prefers_clear_over_more_recent_unclassified():
+    scl = [SCL_VEGETATION, SCL_UNCLASSIFIED]
+    np.testing.assert_array_equal(_pixel(scl, "quality"), [0, 10])
+    np.testing.assert_array_equal(_pixel(scl, "recent"), [1, 11])
+
+
+def test_quality_ties_pick_most_recent():
+    out = _pixel([SCL_NOT_VEGETATED, SCL_VEGETATION, SCL_CLOUD_SHADOW], "quality")
+    np.testing.assert_array_equal(out, [1, 11])
+
+
+@pytest.mark.parametrize("method", ["quality", "recent"])
+def test_all_cloud_pixel_is_nan(method):
+    out = _pixel([SCL_CLOUD_HIGH, SCL_CLOUD_MEDIUM, SCL_CLOUD_SHADOW], method)
+    assert np.isnan(out).all()
+
+
+def test_nan_scl_is_never_selected():
+    out = _pixel([SCL_VEGETATION, np.nan], "recent")
+    np.testing.assert_array_equal(out, [0, 10])
+
+
+def test_best_pixel_composite_sorts_by_time_and_returns_band_y_x():
+    times = pd.to_datetime(["2026-02-10", "2026-02-01"])
+    stack = xr.DataArray(
+        np.array([[[[2.0]], [[20.0]]], [[[1.0]], [[10.0]]]]),
+        dims=("time", "band", "y", "x"),
+        coords={"time": times, "band": ["B04", "B08"]},
+    )
+    scl = xr.DataArray(
+        np.full((2, 1, 1), SCL_VEGETATION, dtype=float),
+        dims=("time", "y", "x"),
+        coords={"time": times},
+    )
+
+    composite = best_pixel_composite(stack, scl, method="recent")
+
+    assert composite.dims == ("band", "y", "x")
+    np.testing.assert_array_equal(composite.sel(band="B08").values, [[20.0]])
+
+
+def test_unknown_method_is_rejected():
+    stack = xr.DataArray(np.zeros((1, 1, 1, 1)), dims=("time", "band", "y", "x"))
+    scl = xr.DataArray(np.zeros((1, 1, 1)), dims=("time", "y", "x"))
+    with pytest.raises(ValueError):
+        best_pixel_composite(stack, scl, method="median")
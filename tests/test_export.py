@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from src.database.db_manager import DBManager
+from src.export import export_results
+
+PROJECT = "test_grid"
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DBManager(tmp_path / "registry.sqlite", sharded=False)
+    db.register_project(PROJECT)
+    return db
+
+
+def _insert(db: DBManager, *rows):
+    """
+    rows: (module, severity, status, lat, lon, detected_at, last_seen)
+    """
+    with db._get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO analysis_results (project_name, module_type, severity, status, latitude, longitude, "
+            "description, detected_at, last_seen) VALUES (?, ?, ?, ?, ?, ?, 'test', ?, ?)",
+            [(PROJECT,) + tuple(row) for row in rows],
+        )
+
+
+def _ids(db: DBManager, **filters) -> list:
+    return [row["id"] for chunk in db.iter_results(PROJECT, **filters) for row in chunk]
+
+
+def test_bbox_keeps_hotspots_on_the_edge(db):
+    _insert(
+        db,
+        ("VEG", "HIGH", "ACTIVE", 51.1, 9.5, "2026-01-01 10:00:00", "2026-01-01 10:00:00"),
+        ("VEG", "HIGH", "ACTIVE", 51.0, 9.0, "2026-01-01 10:00:00", "2026-01-01 10:00:00"),
+        ("VEG", "HIGH", "ACTIVE", 51.1000005, 9.5, "2026-01-01 10:00:00", "2026-01-01 10:00:00"),
+        ("VEG", "HIGH", "ACTIVE", 51.05, 10.0000005, "2026-01-01 10:00:00", "2026-01-01 10:00:00"),
+    )
+    assert _ids(db, bbox=[9.0, 51.0, 10.0, 51.1]) == [1, 2]
+
+
+def test_date_only_until_includes_the_whole_day(db):
+    _insert(
+        db,
+        ("VEG", "HIGH", "ACTIVE", 51.0, 9.5, "2026-01-31 00:00:00", "2026-01-31 00:00:00"),
+        ("VEG", "HIGH", "ACTIVE", 51.0, 9.5, "2026-01-31 23:59:59.999999", "2026-01-31 23:59:59.999999"),
+        ("VEG", "HIGH", "ACTIVE", 51.0, 9.5, "2026-02-01 00:00:00", "2026-02-01 00:00:00"),
+    )
+    assert _ids(db, until="2026-01-31") == [1, 2]
+    assert _ids(db, since="2026-01-31") == [1, 2, 3]
+    assert _ids(db, since="2026-02-01") == [3]
+
+
+def test_iso_t_separated_bounds(db):
+    _insert(
+        db,
+        ("VEG", "HIGH", "ACTIVE", 51.0, 9.5, "2026-01-31 11:00:00", "2026-01-31 11:00:00"),
+        ("VEG", "HIGH", "ACTIVE", 51.0, 9.5, "2026-01-31 13:00:00", "2026-01-31 13:00:00"),
+    )
+    assert _ids(db, until="2026-01-31T12:00:00") == [1]
+    assert _ids(db, since="2026-01-31T12:00:00") == [2]
+
+
+def test_module_severity_and_active_filters(db):
+    _insert(
+        db,
+        ("VEG", "HIGH", "ACTIVE", 51.0, 9.5, "2026-01-01 10:00:00", "2026-01-01 10:00:00"),
+        ("GAS", "MEDIUM", "ACTIVE", 51.0, 9.5, "2026-01-01 10:00:00", "2026-01-01 10:00:00"),
+        ("THERMAL", "HIGH", "RESOLVED", 51.0, 9.5, "2026-01-01 10:00:00", "2026-01-01 10:00:00"),
+        ("GROUND", "LOW", "ACTIVE", 51.0, 9.5, "2026-01-01 10:00:00", "2026-01-01 10:00:00"),
+    )
+    assert _ids(db, modules=["VEG", "THERMAL"]) == [1, 3]
+    assert _ids(db, severities=["HIGH", "LOW"]) == [1, 3, 4]
+    assert _ids(db, active_only=True) == [1, 2, 4]
+    assert _ids(db, modules=["VEG", "THERMAL"], severities=["HIGH"], active_only=True) == [1]
+
+
+def test_chunksize_splits_rows(db):
+    _insert(db, *[("VEG", "HIGH", "ACTIVE", 51.0 + i * 0.01, 9.5, "2026-01-01 10:00:00", "2026-01-01 10:00:00") for i in range(5)])
+    chunks = list(db.iter_results(PROJECT, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [row["id"] for chunk in chunks for row in chunk] == [1, 2, 3, 4, 5]
+
+
+def test_geojsonseq_export(db, tmp_path):
+    _insert(
+        db,
+        ("VEG", "HIGH", "ACTIVE", 51.0, 9.5, "2026-01-01 10:00:00", "2026-01-02 10:00:00"),
+        ("GAS", "MEDIUM", "RESOLVED", 51.2, 9.7, "2026-01-01 10:00:00", "2026-01-01 10:00:00"),
+    )
+    output_path = tmp_path / "export" / "hotspots.ndjson"
+    assert export_results(db, PROJECT, output_path, chunksize=1) == 2
+
+    lines = output_path.read_text(encoding="utf-8").splitlines()
+    features = [json.loads(line) for line in lines]
+    assert len(features) == 2
+    assert all(feature["type"] == "Feature" for feature in features)
+    # GeoJSON coordinates are lon, lat
+    assert features[0]["geometry"] == {"type": "Point", "coordinates": [9.5, 51.0]}
+    assert features[0]["properties"]["module_type"] == "VEG"
+    assert features[0]["properties"]["last_seen"] == "2026-01-02 10:00:00"
+    assert features[1]["properties"]["status"] == "RESOLVED"
+
+
+def test_unknown_export_format_is_rejected(db, tmp_path):
+    with pytest.raises(ValueError):
+        export_results(db, PROJECT, tmp_path / "hotspots.csv")
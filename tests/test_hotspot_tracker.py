@@ -0,0 +1,133 @@
+import sqlite3
+
+import pytest
+
+from src.database.db_manager import DBManager
+from src.database.hotspot_tracker import METERS_PER_DEGREE, HotspotTracker
+
+PROJECT = "test_grid"
+LAT, LON = 51.0, 9.5
+
+
+def _detection(north_m: float = 0.0, severity: str = "HIGH") -> dict:
+    return {
+        "lat": LAT + north_m / METERS_PER_DEGREE,
+        "lon": LON,
+        "severity": severity,
+        "description": "Dense vegetation detected within 5m of power line.",
+    }
+
+
+def _rows(db: DBManager) -> list:
+    with db._get_results_connection(PROJECT) as conn:
+        conn.row_factory = sqlite3.Row
+        return [dict(row) for row in conn.execute("SELECT * FROM analysis_results ORDER BY id")]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DBManager(tmp_path / "registry.sqlite", sharded=False)
+    db.register_project(PROJECT)
+    return db
+
+
+@pytest.fixture
+def tracker(db):
+    return HotspotTracker(db, missed_runs_to_resolve=2)
+
+
+def test_recurring_detection_updates_the_hotspot(db, tracker):
+    assert tracker.track(PROJECT, "VEG", [_detection()]) == {"new": 1, "updated": 0, "resolved": 0}
+    assert tracker.track(PROJECT, "VEG", [_detection(severity="MEDIUM")]) == {"new": 0, "updated": 1, "resolved": 0}
+
+    (row,) = _rows(db)
+    assert row["occurrences"] == 2
+    assert row["severity"] == "MEDIUM"
+    assert row["status"] == "ACTIVE"
+
+
+def test_other_modules_are_not_matched(db, tracker):
+    tracker.track(PROJECT, "VEG", [_detection()])
+    assert tracker.track(PROJECT, "THERMAL", [_detection()])["new"] == 1
+    assert len(_rows(db)) == 2
+
+
+def test_match_tolerance(db, tracker):
+    # VEG matches within 30 m
+    tracker.track(PROJECT, "VEG", [_detection()])
+    assert tracker.track(PROJECT, "VEG", [_detection(north_m=20)])["updated"] == 1
+    assert tracker.track(PROJECT, "VEG", [_detection(north_m=60)])["new"] == 1
+    assert len(_rows(db)) == 2
+
+
+def test_each_hotspot_is_matched_once_per_run(db, tracker):
+    tracker.track(PROJECT, "VEG", [_detection()])
+    stats = tracker.track(PROJECT, "VEG", [_detection(), _detection(north_m=5)])
+    assert stats == {"new": 1, "updated": 1, "resolved": 0}
+
+
+def test_hotspot_resolves_after_missed_runs_and_reactivates(db, tracker):
+    tracker.track(PROJECT, "VEG", [_detection()])
+
+    assert tracker.track(PROJECT, "VEG", [])["resolved"] == 0
+    assert tracker.track(PROJECT, "VEG", [])["resolved"] == 1
+    assert _rows(db)[0]["status"] == "RESOLVED"
+
+    assert tracker.track(PROJECT, "VEG", [_detection()]) == {"new": 0, "updated": 1, "resolved": 0}
+    (row,) = _rows(db)
+    assert row["status"] == "ACTIVE"
+    assert row["missed_runs"] == 0
+
+
+def test_runs_without_imagery_are_not_missed_runs(db, tracker):
+    tracker.track(PROJECT, "VEG", [_detection()])
+    for _ in range(3):
+        assert tracker.track(PROJECT, "VEG", None) == {"new": 0, "updated": 0, "resolved": 0}
+
+    (row,) = _rows(db)
+    assert row["status"] == "ACTIVE"
+    assert row["missed_runs"] == 0
+
+
+def test_migration_merges_duplicates_of_untracked_registries(tmp_path):
+    db_path = tmp_path / "registry.sqlite"
+    # Schema and append-only rows written before hotspot tracking existed
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE analysis_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_name TEXT NOT NULL,
+                module_type TEXT NOT NULL,
+                latitude REAL,
+                longitude REAL,
+                severity TEXT,
+                description TEXT,
+                detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO analysis_results (project_name, module_type, latitude, longitude, severity, description, detected_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (PROJECT, "VEG", LAT, LON, "MEDIUM", "run 1", "2026-01-01 10:00:00"),
+                (PROJECT, "VEG", LAT, LON, "HIGH", "run 2", "2026-01-06 10:00:00"),
+                (PROJECT, "VEG", LAT, LON, "HIGH", "run 3", "2026-01-11 10:00:00"),
+                (PROJECT, "GAS", LAT, LON, "MEDIUM", "gas", "2026-01-11 10:00:00"),
+            ],
+        )
+
+    db = DBManager(db_path, sharded=False)
+    rows = _rows(db)
+    assert len(rows) == 2
+    veg = next(row for row in rows if row["module_type"] == "VEG")
+    assert veg["occurrences"] == 3
+    assert veg["detected_at"] == "2026-01-01 10:00:00"
+    assert veg["last_seen"] == "2026-01-11 10:00:00"
+    assert veg["description"] == "run 3"
+
+    with db._get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM analysis_results_rtree").fetchone()[0] == 2
+
+    # The merged hotspot is matched by the next run instead of leaving stale duplicates behind
+    tracker = HotspotTracker(db)
+    assert tracker.track(PROJECT, "VEG", [_detection()]) == {"new": 0, "updated": 1, "resolved": 0}
@@ -0,0 +1,79 @@
+import re
+
+import pytest
+
+from src import instrumentation
+from src.instrumentation import RunMetrics
+
+
+def test_prometheus_exposition():
+    run = RunMetrics('grid "north"\\east')
+    run.status = "COMPLETED"
+    run.duration_seconds = 1.5
+    run.add_span("stac.search", 0.25)
+    run.add_span("stac.search", 0.75)
+    run.add_span("worker.db_write", 0.1)
+    run.increment("rows_written", 3)
+    text = run.to_prometheus()
+
+    assert text.endswith("\n")
+    assert 'project="grid \\"north\\"\\\\east"' in text
+    assert 'mayil_stage_seconds{project="grid \\"north\\"\\\\east",stage="stac.search"} 1.000000' in text
+    assert 'mayil_stage_calls{project="grid \\"north\\"\\\\east",stage="stac.search"} 2' in text
+    assert 'mayil_rows_written{project="grid \\"north\\"\\\\east"} 3' in text
+
+    types = re.findall(r"^# TYPE (\S+) (\S+)$", text, flags=re.MULTILINE)
+    names = [name for name, _ in types]
+    assert len(names) == len(set(names))
+    assert set(names) == {"mayil_run_duration_seconds", "mayil_stage_seconds", "mayil_stage_calls", "mayil_rows_written"}
+    assert all(kind == "gauge" for _, kind in types)
+
+    # Every sample belongs to a declared metric
+    samples = [line.split("{")[0] for line in text.splitlines() if line and not line.startswith("#")]
+    assert set(samples) <= set(names)
+
+
+def test_track_run_records_spans_and_counters():
+    with instrumentation.track_run("grid") as run:
+        with instrumentation.span("worker.ingest"):
+            pass
+        instrumentation.increment("items_searched", 4)
+
+    assert run.status == "COMPLETED"
+    assert run.spans["worker.ingest"]["calls"] == 1
+    assert run.counters == {"items_searched": 4}
+    assert run.duration_seconds > 0
+
+
+def test_track_run_marks_failed_runs():
+    with pytest.raises(RuntimeError):
+        with instrumentation.track_run("grid") as run:
+            with instrumentation.span("worker.veg"):
+                raise RuntimeError("boom")
+
+    assert run.status == "FAILED"
+    assert run.spans["worker.veg"]["calls"] == 1
+
+    # Nothing is recorded once the run is over
+    with instrumentation.span("worker.veg"):
+        instrumentation.increment("rows_written")
+    assert run.spans["worker.veg"]["calls"] == 1
+    assert "rows_written" not in run.counters
+
+
+def test_slow_runs_are_profiled(tmp_path, monkeypatch):
+    monkeypatch.setenv("MAYIL_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("MAYIL_PROFILE_MIN_SECONDS", "0")
+    with instrumentation.track_run("grid") as run:
+        sum(range(1000))
+
+    assert (tmp_path / f"grid_{run.run_id}.prof").exists()
+
+
+def test_write_run_reports(tmp_path):
+    with instrumentation.track_run("grid") as run:
+        instrumentation.increment("rows_written", 2)
+    instrumentation.write_run_reports(run, tmp_path / "processed")
+
+    assert '"rows_written": 2' in (tmp_path / "processed" / "run_metrics.json").read_text(encoding="utf-8")
+    assert (tmp_path / "processed" / "run_metrics.prom").read_text(encoding="utf-8") == run.to_prometheus()
@@ -0,0 +1,88 @@
+import sqlite3
+
+import pytest
+
+from src.database.db_manager import DBManager
+from modules.risk_fusion import RiskFusion
+
+PROJECT = "test_grid"
+T0 = "2026-01-01 00:00:00.000000"
+T1 = "2026-01-02 00:00:00.000000"
+T2 = "2026-01-03 00:00:00.000000"
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DBManager(tmp_path / "registry.sqlite", sharded=False)
+    db.register_project(PROJECT)
+    with db._get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO assets (project_name, asset_id, asset_type, latitude, longitude) VALUES (?, ?, ?, ?, ?)",
+            [(PROJECT, "way/1", "line", 51.0, 9.5), (PROJECT, "node/2", "substation", 51.1, 9.6), (PROJECT, "node/3", "tower", 51.2, 9.7)],
+        )
+        conn.executemany(
+            "INSERT INTO analysis_results (id, project_name, module_type, latitude, longitude, severity, status, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (1, PROJECT, "VEG", 51.0, 9.5, "HIGH", "ACTIVE", T0),
+                (2, PROJECT, "THERMAL", 51.0, 9.5, "MEDIUM", "RESOLVED", T0),
+                (3, PROJECT, "GAS", 51.1, 9.6, "LOW", "ACTIVE", T0),
+                (4, PROJECT, "THERMAL", 51.2, 9.7, "HIGH", "RESOLVED", T0),
+                (5, PROJECT, "GROUND", 52.0, 10.0, "HIGH", "ACTIVE", T0),
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO result_asset_links (result_id, project_name, asset_id, distance_m) VALUES (?, ?, ?, ?)",
+            [(1, PROJECT, "way/1", 5.0), (2, PROJECT, "way/1", 12.0), (3, PROJECT, "node/2", 800.0),
+             (4, PROJECT, "node/3", 40.0), (5, PROJECT, None, None)],
+        )
+    return db
+
+
+def _risk(db: DBManager) -> dict:
+    with db._get_connection() as conn:
+        conn.row_factory = sqlite3.Row
+        return {row["asset_id"]: dict(row) for row in conn.execute("SELECT * FROM asset_risk")}
+
+
+def test_rescore_sums_active_hotspots_per_asset(db):
+    with db._get_connection() as conn:
+        assert RiskFusion(db)._rescore(conn, PROJECT, None, T1) == 3
+    risk = _risk(db)
+
+    # VEG (1.0) x HIGH (10); the resolved THERMAL hotspot does not count
+    assert risk["way/1"]["risk_score"] == 10.0
+    assert (risk["way/1"]["veg_hotspots"], risk["way/1"]["thermal_hotspots"]) == (1, 0)
+    assert risk["way/1"]["max_severity"] == "HIGH"
+    # GAS (1.5) x LOW (1)
+    assert risk["node/2"]["risk_score"] == 1.5
+    assert risk["node/2"]["max_severity"] == "LOW"
+    # Only resolved hotspots left
+    assert risk["node/3"]["risk_score"] == 0
+    assert risk["node/3"]["max_severity"] is None
+    assert all(row["updated_at"] == T1 for row in risk.values())
+
+
+def test_rescore_since_only_touches_changed_assets(db):
+    fusion = RiskFusion(db)
+    with db._get_connection() as conn:
+        fusion._rescore(conn, PROJECT, None, T1)
+        conn.execute("UPDATE analysis_results SET severity = 'HIGH', updated_at = ? WHERE id = 3", (T2,))
+        assert fusion._rescore(conn, PROJECT, T1, T2) == 1
+    risk = _risk(db)
+
+    assert risk["node/2"]["risk_score"] == 15.0
+    assert risk["node/2"]["updated_at"] == T2
+    assert risk["way/1"]["updated_at"] == T1
+
+
+def test_weight_overrides_are_applied(db):
+    with db._get_connection() as conn:
+        RiskFusion(db, module_weights={"VEG": "3"}, severity_weights={"HIGH": 2})._rescore(conn, PROJECT, None, T1)
+    assert _risk(db)["way/1"]["risk_score"] == 6.0
+
+
+@pytest.mark.parametrize("weights", [{"VEG": "inf"}, {"VEG": float("nan")}, {"VEG": -1}, {"VEG": "1 END"}, {"WIND": 1}])
+def test_invalid_weights_are_rejected(db, weights):
+    with pytest.raises(ValueError):
+        RiskFusion(db, module_weights=weights)
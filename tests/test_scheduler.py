@@ -0,0 +1,169 @@
+import sqlite3
+
+import pytest
+
+from src.database.db_manager import DBManager
+from src.scheduler import MODULE_SCHEDULES, REQUESTS_PER_JOB, MonitoringScheduler
+
+PAST = "2000-01-01 00:00:00"
+FUTURE = "2999-01-01 00:00:00"
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DBManager(tmp_path / "registry.sqlite", sharded=False)
+
+
+def _completed_project(db: DBManager, name: str, priority: int = 0, due: dict = None):
+    """
+    Registers a completed project whose schedules are due as given in `due`
+    (module -> next_run_at); modules not listed are not due.
+    """
+    db.register_project(name, priority)
+    db.update_project_status(name, "COMPLETED")
+    MonitoringScheduler(db).ensure_schedules(name)
+    with db._get_connection() as conn:
+        for module in MODULE_SCHEDULES:
+            conn.execute(
+                "UPDATE schedules SET next_run_at = ? WHERE project_name = ? AND module_type = ?",
+                ((due or {}).get(module, FUTURE), name, module),
+            )
+
+
+def _schedule(db: DBManager, name: str, module: str) -> dict:
+    with db._get_connection() as conn:
+        conn.row_factory = sqlite3.Row
+        return dict(conn.execute(
+            "SELECT * FROM schedules WHERE project_name = ? AND module_type = ?", (name, module)
+        ).fetchone())
+
+
+def _expire_leases(db: DBManager):
+    with db._get_connection() as conn:
+        conn.execute("UPDATE schedules SET lease_expires_at = ? WHERE status = 'RUNNING'", (PAST,))
+
+
+def test_pending_projects_by_priority_then_registration(db):
+    for name, priority in [("a", 0), ("b", 5), ("c", 0), ("d", 5)]:
+        db.register_project(name, priority)
+    db.update_project_status("b", "COMPLETED")
+    assert db.get_pending_projects() == ["d", "a", "c"]
+
+
+def test_claim_prefers_priority_then_due_time(db):
+    _completed_project(db, "low", 0, due={"VEG": "1999-01-01 00:00:00"})
+    _completed_project(db, "high", 10, due={"GAS": "2000-06-01 00:00:00", "THERMAL": PAST})
+    scheduler = MonitoringScheduler(db, max_concurrent_jobs=10)
+
+    claimed = [scheduler.claim_next_job("w1") for _ in range(4)]
+    assert [(job["project_name"], job["module_type"]) for job in claimed[:3]] == [
+        ("high", "THERMAL"), ("high", "GAS"), ("low", "VEG")
+    ]
+    assert claimed[3] is None
+    assert _schedule(db, "high", "THERMAL")["lease_owner"] == "w1"
+
+
+def test_claim_honours_max_concurrent_jobs(db):
+    _completed_project(db, "grid", due={module: PAST for module in MODULE_SCHEDULES})
+    scheduler = MonitoringScheduler(db, max_concurrent_jobs=2)
+
+    assert scheduler.claim_next_job("w1") is not None
+    assert scheduler.claim_next_job("w2") is not None
+    assert scheduler.claim_next_job("w3") is None
+
+
+def test_exhausted_budget_skips_to_next_collection(db):
+    _completed_project(db, "grid", due={"VEG": "1999-01-01 00:00:00", "GAS": PAST})
+    scheduler = MonitoringScheduler(db, max_concurrent_jobs=10, rate_budgets={
+        "sentinel-2-l2a": REQUESTS_PER_JOB - 1,
+        "sentinel-5p-l2-netcdf": REQUESTS_PER_JOB,
+    })
+
+    job = scheduler.claim_next_job("w1")
+    assert job["module_type"] == "GAS"
+    # Both budgets are used up now
+    assert scheduler.claim_next_job("w1") is None
+    assert _schedule(db, "grid", "VEG")["status"] == "IDLE"
+
+
+def test_stale_lease_is_reclaimed(db):
+    _completed_project(db, "grid", due={"VEG": PAST})
+    scheduler = MonitoringScheduler(db)
+
+    assert scheduler.claim_next_job("w1")["module_type"] == "VEG"
+    assert scheduler.claim_next_job("w2") is None
+    _expire_leases(db)
+    assert scheduler.claim_next_job("w2")["module_type"] == "VEG"
+    assert _schedule(db, "grid", "VEG")["lease_owner"] == "w2"
+
+
+def test_renewed_lease_is_not_reclaimed(db):
+    _completed_project(db, "grid", due={"VEG": PAST})
+    scheduler = MonitoringScheduler(db)
+
+    job = scheduler.claim_next_job("w1")
+    _expire_leases(db)
+    assert scheduler.renew_lease(job)
+    assert scheduler.claim_next_job("w2") is None
+    assert _schedule(db, "grid", "VEG")["lease_owner"] == "w1"
+
+
+def test_release_does_not_overwrite_a_lease_taken_over(db):
+    _completed_project(db, "grid", due={"VEG": PAST})
+    scheduler = MonitoringScheduler(db)
+
+    stale_job = scheduler.claim_next_job("w1")
+    _expire_leases(db)
+    scheduler.claim_next_job("w2")
+
+    assert not scheduler.renew_lease(stale_job)
+    scheduler.complete_job(stale_job, "2026-02-10T10:30:00Z")
+    row = _schedule(db, "grid", "VEG")
+    assert (row["status"], row["lease_owner"]) == ("RUNNING", "w2")
+    assert row["last_acquisition"] is None
+
+
+def test_complete_job_releases_and_records_acquisition(db):
+    _completed_project(db, "grid", due={"VEG": PAST})
+    scheduler = MonitoringScheduler(db)
+
+    job = scheduler.claim_next_job("w1")
+    scheduler.complete_job(job, "2026-02-10T10:30:00Z")
+    row = _schedule(db, "grid", "VEG")
+    assert (row["status"], row["lease_owner"]) == ("IDLE", None)
+    assert row["last_acquisition"] == "2026-02-10T10:30:00Z"
+    assert row["last_run_at"] is not None
+
+
+def test_reserve_full_run_is_all_or_nothing(db):
+    scheduler = MonitoringScheduler(db, rate_budgets={"landsat-c2-l2": 2})
+
+    assert scheduler.reserve_full_run()
+    assert scheduler.reserve_full_run()
+    assert not scheduler.reserve_full_run()
+
+    with db._get_connection() as conn:
+        used = dict(conn.execute("SELECT collection, used FROM rate_budgets").fetchall())
+    assert used == {spec["collection"]: 2 for spec in MODULE_SCHEDULES.values()}
+
+
+def test_search_window_of_first_recurring_run(db):
+    job = {"module_type": "VEG", "last_acquisition": None}
+    window = MonitoringScheduler(db).search_window(job, "2026-02-15T10:30:00Z")
+    # One Sentinel-2 revisit cycle (5 days) back from the newest acquisition
+    assert window == "2026-02-10T10:30:00.000000Z/2026-02-15T10:30:00.000000Z"
+
+
+def test_search_window_starts_after_last_acquisition(db):
+    job = {"module_type": "VEG", "last_acquisition": "2026-02-10T10:30:00+00:00"}
+    window = MonitoringScheduler(db).search_window(job, "2026-02-15T11:30:00.250000+01:00")
+    assert window == "2026-02-10T10:30:00.000001Z/2026-02-15T10:30:00.250000Z"
+
+
+def test_is_new_acquisition(db):
+    scheduler = MonitoringScheduler(db)
+    job = {"last_acquisition": "2026-02-10T10:30:00Z"}
+    assert not scheduler.is_new_acquisition(job, None)
+    assert not scheduler.is_new_acquisition(job, "2026-02-10T10:30:00+00:00")
+    assert scheduler.is_new_acquisition(job, "2026-02-15T10:30:00Z")
+    assert scheduler.is_new_acquisition({"last_acquisition": None}, "2026-02-15T10:30:00Z")
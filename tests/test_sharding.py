@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+from src import utils
+from src.database.db_manager import DBManager
+from src.database.hotspot_tracker import HotspotTracker
+
+PROJECT = "test_grid"
+DETECTION = {"lat": 51.0, "lon": 9.5, "severity": "HIGH", "description": "Dense vegetation"}
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "BASE_DIR", tmp_path)
+    db = DBManager(tmp_path / "data" / "system" / "global_registry.sqlite", sharded=True)
+    db.register_project(PROJECT)
+    return db
+
+
+def _tables(path) -> set:
+    with sqlite3.connect(path) as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_results_land_in_the_project_shard(db, tmp_path):
+    HotspotTracker(db).track(PROJECT, "VEG", [DETECTION])
+    db.save_run_metrics({
+        "run_id": "run-1", "project_name": PROJECT, "started_at": "2026-01-01T00:00:00+00:00",
+        "duration_seconds": 1.0, "status": "COMPLETED",
+    })
+
+    shard_path = tmp_path / "data" / "projects" / PROJECT / "processed" / "results.sqlite"
+    assert db.get_shard_path(PROJECT) == shard_path
+    with sqlite3.connect(shard_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM analysis_results").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM run_metrics").fetchone()[0] == 1
+
+    registry_tables = _tables(db.db_path)
+    assert "analysis_results" not in registry_tables
+    assert "run_metrics" not in registry_tables
+    assert {"projects", "schedules", "rate_budgets"} <= registry_tables
+
+    assert [len(chunk) for chunk in db.iter_results(PROJECT)] == [1]
+    assert db.get_run_metrics(PROJECT)[0]["run_id"] == "run-1"
+
+
+def test_reads_of_unknown_projects_create_nothing(db, tmp_path):
+    assert list(db.iter_results("unknown")) == []
+    assert db.get_run_metrics("unknown") == []
+    # Runs without imagery don't open the shard either
+    HotspotTracker(db).track("unknown", "VEG", None)
+
+    assert not (tmp_path / "data" / "projects" / "unknown").exists()
+
+
+def test_delete_project_removes_the_shard(db):
+    HotspotTracker(db).track(PROJECT, "VEG", [DETECTION])
+    shard_path = db.get_shard_path(PROJECT)
+    assert shard_path.exists()
+
+    db.delete_project(PROJECT)
+
+    assert not shard_path.exists()
+    assert not shard_path.with_name("results.sqlite-wal").exists()
+    assert not shard_path.with_name("results.sqlite-shm").exists()
+    assert db.get_pending_projects() == []
+    assert list(db.iter_results(PROJECT)) == []
+    assert not shard_path.exists()